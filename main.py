@@ -19,6 +19,7 @@ Usage:
     result = crew.review_pull_request(pr_url)
 """
 
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -58,14 +59,10 @@ def check_setup():
     if not env_file.exists():
         issues.append("⚠️  .env file not found. Copy .env.example to .env and configure.")
 
-    # Check if dependencies are installed
-    try:
-        import crewai
-        import langchain
-        import chromadb
-        import streamlit
-    except ImportError as e:
-        issues.append(f"⚠️  Missing dependency: {e.name}. Run: pip install -r requirements.txt")
+    # Check if dependencies are installed (without importing them)
+    for module_name in ("crewai", "langchain", "chromadb", "streamlit"):
+        if importlib.util.find_spec(module_name) is None:
+            issues.append(f"⚠️  Missing dependency: {module_name}. Run: pip install -r requirements.txt")
 
     # Check knowledge base
     kb_path = Path("data/vector_db")
@@ -3,6 +3,7 @@
 Demo script to run a sample PR review.
 """
 import sys
+import logging
 from pathlib import Path
 import argparse
 
@@ -44,53 +45,49 @@ def main():
         pr_url = args.url
     elif args.example:
         pr_url = EXAMPLE_PRS[args.example]
-        logger.info(f"Using example PR: {args.example}")
+        logger.info("Using example PR: %s", args.example)
     else:
         # Default to Flask example
         pr_url = EXAMPLE_PRS['flask']
         logger.info("Using default Flask example PR")
 
-    logger.info(f"\n{'='*60}")
-    logger.info(f"PR Review Demo")
-    logger.info(f"{'='*60}")
-    logger.info(f"URL: {pr_url}\n")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"\n{'='*60}")
+        logger.info("PR Review Demo")
+        logger.info(f"{'='*60}")
+        logger.info(f"URL: {pr_url}\n")
 
     try:
         # Initialize crew
         logger.info("Initializing review crew...")
         crew = ReviewCrew()
 
-        # Perform review
+        # Perform review, printing the report as it streams in
         logger.info("Starting review process...\n")
-        result = crew.review_pull_request(pr_url)
-
-        # Display results
-        logger.info(f"\n{'='*60}")
-        logger.info("Review Results")
-        logger.info(f"{'='*60}\n")
 
-        if result.get('success'):
-            logger.info("✅ Review completed successfully!\n")
+        # Filled with the PR details once the PR is loaded
+        info = {}
 
-            pr_info = result.get('pr_info', {})
-            logger.info(f"PR Title: {pr_info.get('title')}")
-            logger.info(f"Platform: {pr_info.get('platform')}")
-            logger.info(f"Files Changed: {pr_info.get('files_changed')}")
-            logger.info(f"Additions: {pr_info.get('additions')}")
-            logger.info(f"Deletions: {pr_info.get('deletions')}\n")
+        logger.info("Review Feedback:")
+        logger.info("-" * 60)
+        for chunk in crew.review_pull_request_stream(pr_url, info=info):
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        print()
+        logger.info("-" * 60)
 
-            logger.info("Review Feedback:")
-            logger.info("-" * 60)
-            print(result.get('review', ''))
-            logger.info("-" * 60)
+        logger.info("✅ Review completed successfully!\n")
 
-            return 0
-        else:
-            logger.error(f"❌ Review failed: {result.get('error')}")
-            return 1
+        pr_info = info.get('pr_info', {})
+        logger.info("PR Title: %s", pr_info.get('title'))
+        logger.info("Platform: %s", pr_info.get('platform'))
+        logger.info("Files Changed: %s", pr_info.get('files_changed'))
+        logger.info("Additions: %s", pr_info.get('additions'))
+        logger.info("Deletions: %s", pr_info.get('deletions'))
+        return 0
 
     except Exception as e:
-        logger.error(f"Demo failed: {e}", exc_info=True)
+        logger.error("Demo failed: %s", e, exc_info=True)
         return 1
 
 
@@ -1,10 +1,20 @@
 """
 Multi-agent orchestration using CrewAI for code review.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from contextvars import ContextVar
+from functools import cached_property
+from pathlib import Path
+import asyncio
+import hashlib
+import itertools
 import logging
-from crewai import Agent, Task, Crew, Process
-from langchain_openai import ChatOpenAI
+import pickle
+import re
+import time
+import httpx
+from crewai import Agent, Task, Crew, LLM, Process
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from src.config.settings import settings
 from src.config.prompts import (
@@ -14,54 +24,259 @@ from src.config.prompts import (
     SYNTHESIZER_AGENT_PROMPT,
     SYSTEM_MESSAGE
 )
-from src.data_preparation.base_adapter import PullRequest
-from src.data_preparation.github_adapter import GitHubAdapter
-from src.data_preparation.gitlab_adapter import GitLabAdapter
-from src.data_preparation.bitbucket_adapter import BitbucketAdapter
+from src.config.prompt_templates import (
+    ANALYSIS_TMPL,
+    RETRIEVAL_TMPL,
+    CRITIC_TMPL,
+    SYNTHESIS_TMPL,
+    ANALYSIS_FOCUS_AREAS,
+    RETRIEVAL_GUIDELINE_AREAS,
+    CRITIC_CRITERIA,
+    SYNTHESIS_SECTIONS
+)
+from src.data_preparation.base_adapter import PullRequest, get_adapter
 from src.data_preparation.diff_parser import DiffParser
-from src.rag.retriever import Retriever
-from src.tools.code_analyzer import CodeAnalyzer
+from src.data_preparation.http_client import create_sync_client
+from src.utils.file_cache import atomic_write
+
+if TYPE_CHECKING:
+    from langchain_core.rate_limiters import InMemoryRateLimiter
+    from langchain_openai import ChatOpenAI
+    from src.rag.retriever import Retriever
+    from src.rag.semantic_cache import SemanticCache
+    from src.tools.code_analyzer import CodeAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# PR/MR URL patterns per platform, each tied to its own path form; the
+# scheme is optional and the host matches case-insensitively
+_PR_PATH = r"/(?P<owner>[^/]+)/(?P<repo>[^/]+)/{}/(?P<num>\d+)(?:[/?#]|$)"
+
+_PLATFORM_PATTERNS = {
+    "github": re.compile(r"(?i:github\.com)" + _PR_PATH.format("pull")),
+    "gitlab": re.compile(r"(?i:gitlab\.com)" + _PR_PATH.format("-/merge_requests")),
+    "bitbucket": re.compile(r"(?i:bitbucket\.org)" + _PR_PATH.format("pull-requests"))
+}
+
+# time.monotonic() deadline of the agent task running in this context;
+# asyncio.to_thread copies it into the thread that runs the crew
+_task_deadline: ContextVar[Optional[float]] = ContextVar("task_deadline", default=None)
+
+# Limits on the diff context handed to agents
+MAX_CONTEXT_HUNKS = 10
+MAX_SAMPLE_LINES = 5
+
 
 class ReviewCrew:
     """Orchestrates multiple agents for PR review."""
 
     def __init__(self):
-        """Initialize the review crew."""
-        # Initialize LLM
-        self.llm = ChatOpenAI(
+        """
+        Initialize the review crew.
+
+        Heavy components (LLM client, RAG stack, platform adapters) are
+        constructed lazily on first use.
+        """
+        if not settings.openai_api_key:
+            raise ValueError("OPENAI_API_KEY is not configured. Set it in your .env file.")
+
+        self.diff_parser = DiffParser()
+        # CrewAI's verbose mode echoes full prompts and responses to stdout
+        self.verbose = settings.log_level.upper() == 'DEBUG'
+
+        logger.info("ReviewCrew initialized")
+
+    @cached_property
+    def rate_limiter(self) -> "InMemoryRateLimiter":
+        """Token bucket sized by settings.openai_rpm, shared by every OpenAI request."""
+        from langchain_core.rate_limiters import InMemoryRateLimiter
+
+        return InMemoryRateLimiter(
+            requests_per_second=settings.openai_rpm / 60,
+            check_every_n_seconds=0.05,
+            max_bucket_size=settings.max_parallel_agents
+        )
+
+    @cached_property
+    def http_client(self) -> "httpx.Client":
+        """
+        Keep-alive connection pool shared by the OpenAI clients.
+
+        Every request (including SDK retries) first takes a token from
+        rate_limiter, so agent calls and the synthesis stream together stay
+        within the account's rate limit instead of triggering 429 retries.
+        """
+        return create_sync_client(
+            max_connections=settings.max_parallel_agents * 4,
+            on_request=self._before_request
+        )
+
+    def _before_request(self, request: httpx.Request):
+        """
+        Rate-limit an OpenAI request and fit it into the task's time budget.
+
+        Inside an agent task, each request's timeouts are capped to the time
+        left before the task deadline, and requests made after it fail at
+        once, so a timed-out agent stops calling the LLM instead of running
+        on in its worker thread.
+        """
+        self.rate_limiter.acquire()
+
+        deadline = _task_deadline.get()
+        if deadline is None:
+            return
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise httpx.TimeoutException("Agent time budget exhausted", request=request)
+
+        timeouts = request.extensions.get("timeout", {})
+        request.extensions["timeout"] = {
+            name: min(value, remaining) if value is not None else remaining
+            for name, value in (timeouts or httpx.Timeout(remaining).as_dict()).items()
+        }
+
+    @cached_property
+    def llm(self) -> LLM:
+        """
+        Shared CrewAI LLM for all agents.
+
+        CrewAI converts other LLM objects into its own provider client and
+        drops their retry, pool and limiter settings, so these are passed to
+        CrewAI directly; rate limiting happens in the shared http_client.
+        """
+        return LLM(
             model=settings.openai_model,
             temperature=settings.openai_temperature,
-            api_key=settings.openai_api_key
+            api_key=settings.openai_api_key,
+            timeout=settings.agent_timeout,
+            max_retries=settings.openai_max_retries,
+            client_params={"http_client": self.http_client}
         )
 
-        # Initialize components
-        self.retriever = Retriever()
-        self.diff_parser = DiffParser()
-        self.code_analyzer = CodeAnalyzer()
+    @cached_property
+    def chat_llm(self) -> "ChatOpenAI":
+        """LangChain client used to stream the synthesis stage."""
+        from langchain_openai import ChatOpenAI
 
-        # Initialize platform adapters
-        self.adapters = {
-            'github': GitHubAdapter(),
-            'gitlab': GitLabAdapter(),
-            'bitbucket': BitbucketAdapter()
-        }
+        return ChatOpenAI(
+            model=settings.openai_model,
+            temperature=settings.openai_temperature,
+            api_key=settings.openai_api_key,
+            timeout=settings.agent_timeout,
+            max_retries=settings.openai_max_retries,
+            http_client=self.http_client
+        )
 
-        logger.info("ReviewCrew initialized")
+    @cached_property
+    def retriever(self) -> "Retriever":
+        """Knowledge base retriever."""
+        from src.rag.retriever import Retriever
+
+        return Retriever()
+
+    @cached_property
+    def code_analyzer(self) -> "CodeAnalyzer":
+        """Static analysis tools wrapper."""
+        from src.tools.code_analyzer import CodeAnalyzer
+
+        return CodeAnalyzer()
 
-    def _detect_platform(self, url: str) -> str:
-        """Detect platform from URL."""
-        if 'github.com' in url:
-            return 'github'
-        elif 'gitlab.com' in url:
-            return 'gitlab'
-        elif 'bitbucket.org' in url:
-            return 'bitbucket'
+    @cached_property
+    def semantic_cache(self) -> Optional["SemanticCache"]:
+        """Semantic review cache, or None when disabled."""
+        if not settings.semantic_cache_enabled:
+            return None
+
+        from src.rag.semantic_cache import SemanticCache
+
+        return SemanticCache()
+
+    def _cached_fetch(
+        self,
+        platform: str,
+        url: str,
+        parsed: Optional[Dict[str, Any]] = None,
+        refresh: bool = False
+    ) -> PullRequest:
+        """
+        Fetch a PR, reusing an on-disk copy if the PR has not been updated.
+
+        Args:
+            platform: Platform name
+            url: URL of the PR/MR
+            parsed: Pre-parsed URL components for the adapter
+            refresh: Ignore cached copies and fetch from the platform
+
+        Returns:
+            PullRequest object
+        """
+        adapter = get_adapter(platform)
+        if not settings.cache_enabled:
+            return adapter.fetch_pull_request(url, parsed)
+
+        try:
+            updated_at = adapter.get_updated_at(url, parsed)
+        except Exception as e:
+            logger.warning("Could not check PR freshness, skipping cache: %s", e)
+            updated_at = None
+
+        if updated_at is None:
+            # Freshness unknown: only the adapter's short-lived in-memory copy
+            # (at most PR_CACHE_TTL seconds old) can be reused
+            return adapter.get_pull_request(url, parsed, refresh=refresh)
+
+        key = hashlib.blake2b(f"{platform}:{url}:{updated_at}".encode(), digest_size=16).hexdigest()
+        cache_path = Path(settings.cache_directory) / "pr" / f"{key}.pkl"
+
+        if not refresh and cache_path.exists():
+            try:
+                with cache_path.open('rb') as f:
+                    pr = pickle.load(f)
+                logger.info("Loaded PR from cache: %s", cache_path.name)
+                return pr
+            except Exception as e:
+                logger.warning("Ignoring unreadable PR cache entry %s: %s", cache_path, e)
+
+        # The PR changed (or is new), so any in-memory copy is stale too
+        pr = adapter.get_pull_request(url, parsed, refresh=True)
+
+        try:
+            atomic_write(cache_path, pickle.dumps(pr, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            logger.warning("Could not write PR cache entry: %s", e)
+
+        return pr
+
+    def _detect_platform(self, url: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Detect platform from URL and parse its components.
+
+        Args:
+            url: URL of the PR/MR
+
+        Returns:
+            Tuple of platform name and URL components in the shape the
+            platform adapter's parse_url returns
+        """
+        for platform, pattern in _PLATFORM_PATTERNS.items():
+            match = pattern.search(url)
+            if match:
+                break
         else:
             raise ValueError(f"Unsupported platform URL: {url}")
 
+        owner, repo, number = match['owner'], match['repo'], int(match['num'])
+
+        if platform == 'github':
+            parsed = {"owner": owner, "repo": repo, "pr_number": number}
+        elif platform == 'gitlab':
+            parsed = {"project": f"{owner}/{repo}", "mr_number": number}
+        else:
+            parsed = {"workspace": owner, "repo": repo, "pr_number": number}
+
+        return platform, parsed
+
     def _create_analyzer_agent(self) -> Agent:
         """Create the code analyzer agent."""
         return Agent(
@@ -69,7 +284,7 @@ class ReviewCrew:
             goal='Identify potential issues, bugs, and improvements in code changes',
             backstory=ANALYZER_AGENT_PROMPT,
             llm=self.llm,
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False
         )
 
@@ -80,7 +295,7 @@ class ReviewCrew:
             goal='Find relevant best practices, patterns, and guidelines from the knowledge base',
             backstory=RETRIEVER_AGENT_PROMPT,
             llm=self.llm,
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False
         )
 
@@ -91,7 +306,7 @@ class ReviewCrew:
             goal='Evaluate and validate review suggestions for quality and accuracy',
             backstory=CRITIC_AGENT_PROMPT,
             llm=self.llm,
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False
         )
 
@@ -102,30 +317,37 @@ class ReviewCrew:
             goal='Create comprehensive, actionable code review feedback',
             backstory=SYNTHESIZER_AGENT_PROMPT,
             llm=self.llm,
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False
         )
 
     def _prepare_pr_context(self, pr: PullRequest) -> Dict[str, Any]:
         """Prepare PR context for agents."""
-        # Parse diffs
-        all_hunks = []
-        for file_change in pr.files_changed:
-            if file_change.patch:
-                hunks = self.diff_parser.parse_patch(file_change.patch)
-                all_hunks.extend(hunks)
-
-        # Get change summary
-        change_summary = self.diff_parser.get_change_summary(all_hunks)
+        # Parse diffs lazily, stopping once enough hunks are collected
+        def _hunk_iter():
+            for file_change in pr.files_changed:
+                if file_change.patch:
+                    yield from self.diff_parser.parse_patch(
+                        file_change.patch,
+                        max_hunks=MAX_CONTEXT_HUNKS,
+                        max_added_lines_per_hunk=MAX_SAMPLE_LINES,
+                        file_path=file_change.filename
+                    )
+
+        context_hunks = list(itertools.islice(_hunk_iter(), MAX_CONTEXT_HUNKS))
+
+        # Get change summary from per-file stats (no hunk parsing needed)
+        change_summary = self.diff_parser.get_file_change_summary(pr.files_changed)
 
         # Prepare code context
         code_changes = []
-        for hunk in all_hunks[:10]:  # Limit to first 10 hunks for context
+        for hunk in context_hunks:
             code_changes.append({
                 'file': hunk.file_path,
-                'added': len(hunk.added_lines),
+                # added_lines is truncated; derive the count from the hunk header
+                'added': hunk.new_count - len(hunk.context_lines),
                 'removed': len(hunk.removed_lines),
-                'sample_changes': hunk.added_lines[:5]  # First 5 added lines
+                'sample_changes': hunk.added_lines
             })
 
         context = {
@@ -146,153 +368,418 @@ class ReviewCrew:
 
         return context
 
-    def review_pull_request(self, pr_url: str, platform: Optional[str] = None) -> Dict[str, Any]:
+    async def _run_task(self, agent: Agent, task: Task, semaphore: asyncio.Semaphore) -> str:
         """
-        Review a pull request using the agent crew.
+        Run a single task on its own single-agent crew.
+
+        The crew runs in a worker thread that cannot be cancelled, so the
+        settings.agent_timeout budget is enforced on its LLM requests (see
+        _before_request) and the semaphore is held until the thread has
+        actually finished.
+
+        Args:
+            agent: Agent executing the task
+            task: Task to execute
+            semaphore: Bounds the number of concurrently running agents
+
+        Returns:
+            Raw task output
+
+        Raises:
+            asyncio.TimeoutError: If the task ran out of its time budget
+        """
+        async with semaphore:
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=self.verbose
+            )
+            deadline = time.monotonic() + settings.agent_timeout
+            token = _task_deadline.set(deadline)
+            try:
+                result = await crew.kickoff_async()
+            except Exception as e:
+                if time.monotonic() >= deadline:
+                    raise asyncio.TimeoutError(
+                        f"Agent task exceeded {settings.agent_timeout}s"
+                    ) from e
+                raise
+            finally:
+                _task_deadline.reset(token)
+            return str(result)
+
+    async def _run_analysis_stages(
+        self,
+        pr: PullRequest,
+        context: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, str]:
+        """
+        Run the analyzer, retriever and critic stages.
+
+        The analyzer and retriever have no data dependency on each other and
+        run concurrently; the critic then validates the analysis.
+
+        Args:
+            pr: Pull request under review
+            context: Prepared PR context
+            semaphore: Bounds the number of concurrently running agents
+
+        Returns:
+            Outputs keyed by 'analysis', 'retrieval' and 'critic'
+        """
+        # Create agents
+        analyzer = self._create_analyzer_agent()
+        retriever = self._create_retriever_agent()
+        critic = self._create_critic_agent()
+
+        # Create tasks
+        analysis_task = Task(
+            description=ANALYSIS_TMPL.render(
+                pr=pr,
+                files=context['all_files'][:20],
+                focus_areas=ANALYSIS_FOCUS_AREAS
+            ),
+            agent=analyzer,
+            expected_output="List of identified issues with severity, location, and explanation"
+        )
+
+        retrieval_task = Task(
+            description=RETRIEVAL_TMPL.render(
+                pr=pr,
+                change_summary=context['change_summary'],
+                guideline_areas=RETRIEVAL_GUIDELINE_AREAS
+            ),
+            agent=retriever,
+            expected_output="Relevant best practices and patterns from knowledge base"
+        )
+
+        # Stage 1: analysis and retrieval run concurrently
+        analysis_result, retrieval_result = await asyncio.gather(
+            self._run_task(analyzer, analysis_task, semaphore),
+            self._run_task(retriever, retrieval_task, semaphore)
+        )
+
+        critic_task = Task(
+            description=CRITIC_TMPL.render(
+                analysis_result=analysis_result,
+                criteria=CRITIC_CRITERIA,
+                min_score=settings.min_confidence_score
+            ),
+            agent=critic,
+            expected_output="Validated and scored list of issues with quality assessment"
+        )
+
+        # Stage 2: critic depends only on the analysis
+        critic_result = await self._run_task(critic, critic_task, semaphore)
+
+        return {
+            'analysis': analysis_result,
+            'retrieval': retrieval_result,
+            'critic': critic_result
+        }
+
+    def _render_synthesis(self, pr: PullRequest, stage_results: Dict[str, str]) -> str:
+        """Render the synthesis task description from the earlier stage outputs."""
+        return SYNTHESIS_TMPL.render(
+            pr=pr,
+            critic_result=stage_results['critic'],
+            retrieval_result=stage_results['retrieval'],
+            analysis_result=stage_results['analysis'],
+            sections=SYNTHESIS_SECTIONS
+        )
+
+    async def _run_review_pipeline(
+        self,
+        pr: PullRequest,
+        context: Dict[str, Any],
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> str:
+        """
+        Run the agents as a fan-out/fan-in pipeline.
+
+        Args:
+            pr: Pull request under review
+            context: Prepared PR context
+            semaphore: Bounds concurrently running agents (shared across
+                reviews in a batch); a per-review one is created if None
+
+        Returns:
+            Final review text
+        """
+        semaphore = semaphore or asyncio.Semaphore(settings.max_parallel_agents)
+        stage_results = await self._run_analysis_stages(pr, context, semaphore)
+
+        synthesis_task = Task(
+            description=self._render_synthesis(pr, stage_results),
+            agent=self._create_synthesizer_agent(),
+            expected_output="Complete, structured code review report"
+        )
+
+        # Stage 3: synthesis fans in all previous outputs
+        return await self._run_task(synthesis_task.agent, synthesis_task, semaphore)
+
+    def _load_pull_request(
+        self,
+        pr_url: str,
+        platform: Optional[str] = None,
+        refresh: bool = False
+    ) -> Tuple[str, PullRequest, Dict[str, Any]]:
+        """
+        Fetch a PR and prepare its agent context.
 
         Args:
             pr_url: URL of the PR/MR
             platform: Platform name (auto-detected if not provided)
+            refresh: Re-fetch the PR instead of using cached copies
 
         Returns:
-            Review results
+            Tuple of platform name, PullRequest and prepared context
         """
-        try:
-            # Detect platform
-            if not platform:
-                platform = self._detect_platform(pr_url)
-
-            logger.info(f"Reviewing PR from {platform}: {pr_url}")
-
-            # Fetch PR data
-            adapter = self.adapters.get(platform)
-            if not adapter:
-                raise ValueError(f"Unsupported platform: {platform}")
-
-            pr = adapter.fetch_pull_request(pr_url)
-            logger.info(f"Fetched PR: {pr.title}")
-
-            # Prepare context
-            context = self._prepare_pr_context(pr)
-
-            # Create agents
-            analyzer = self._create_analyzer_agent()
-            retriever = self._create_retriever_agent()
-            critic = self._create_critic_agent()
-            synthesizer = self._create_synthesizer_agent()
-
-            # Create tasks
-            analysis_task = Task(
-                description=f"""Analyze the following code changes and identify potential issues:
-                
-PR Title: {pr.title}
-Description: {pr.description}
-Language: {pr.language}
-Files Changed: {pr.changed_files}
-Additions: {pr.additions} / Deletions: {pr.deletions}
-
-Files:
-{chr(10).join(f"- {f}" for f in context['all_files'][:20])}
-
-Focus on:
-1. Security vulnerabilities
-2. Performance issues
-3. Potential bugs
-4. Code quality concerns
-5. Best practice violations
-
-Provide specific file and line references where possible.
-""",
-                agent=analyzer,
-                expected_output="List of identified issues with severity, location, and explanation"
-            )
+        # Detect platform
+        parsed = None
+        if not platform:
+            platform, parsed = self._detect_platform(pr_url)
 
-            retrieval_task = Task(
-                description=f"""Based on the code changes in this {pr.language or 'unknown language'} PR, 
-retrieve relevant best practices and patterns from the knowledge base.
-
-Focus areas based on the analysis:
-- Security guidelines
-- Performance optimization
-- Code quality standards
-- Language-specific best practices
-
-Return the most relevant guidelines that apply to this review.
-""",
-                agent=retriever,
-                expected_output="Relevant best practices and patterns from knowledge base",
-                context=[analysis_task]
-            )
+        logger.info("Reviewing PR from %s: %s", platform, pr_url)
 
-            critic_task = Task(
-                description="""Review the identified issues from the analyzer and evaluate each one:
-
-For each issue, assess:
-1. Is this a real issue or false positive?
-2. Is the severity level appropriate?
-3. Is the suggestion actionable and specific?
-4. Is it directly related to the changes?
-
-Assign a quality score (0.0-1.0) to each suggestion.
-Filter out suggestions with score < 0.6.
-Provide reasoning for your evaluations.
-""",
-                agent=critic,
-                expected_output="Validated and scored list of issues with quality assessment",
-                context=[analysis_task]
-            )
+        # Fetch PR data
+        pr = self._cached_fetch(platform, pr_url, parsed, refresh=refresh)
+        logger.info("Fetched PR: %s", pr.title)
 
-            synthesis_task = Task(
-                description=f"""Create a comprehensive code review report for this PR.
+        # Prepare context
+        context = self._prepare_pr_context(pr)
 
-PR: {pr.title}
+        return platform, pr, context
+
+    def _lookup_cached_review(
+        self,
+        pr: PullRequest,
+        context: Dict[str, Any],
+        refresh: bool = False
+    ) -> Tuple[Optional[str], Optional[str], List[float], Optional[str]]:
+        """
+        Look up a near-duplicate review in the semantic cache.
+
+        Identical patches are found by fingerprint before anything is
+        embedded; otherwise the embedded key is matched by similarity.
+
+        Args:
+            pr: Pull request under review
+            context: Prepared PR context
+            refresh: Skip the lookup but still build the key, so the fresh
+                review is stored for later lookups
 
-Combine:
-1. Validated issues from the critic
-2. Relevant best practices from the retriever
-3. Original analysis insights
+        Returns:
+            Tuple of cached review (None on a miss), and the cache key text,
+            key embedding and patch fingerprint for storing the fresh review
+        """
+        if not self.semantic_cache:
+            return None, None, [], None
+
+        fingerprint = self.semantic_cache.fingerprint(pr)
+        if fingerprint and not refresh:
+            cached_review = self.semantic_cache.lookup_exact(fingerprint)
+            if cached_review is not None:
+                return cached_review, None, [], fingerprint
+
+        cache_key_text = self.semantic_cache.build_key_text(pr, context['change_summary'])
+        cache_embedding = self.semantic_cache.embed_key(cache_key_text)
+        if refresh:
+            return None, cache_key_text, cache_embedding, fingerprint
+        cached_review = self.semantic_cache.lookup(cache_embedding, repository=pr.repository)
+        return cached_review, cache_key_text, cache_embedding, fingerprint
+
+    async def _review_pull_request_async(
+        self,
+        pr_url: str,
+        platform: Optional[str] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Review a pull request without blocking the event loop.
 
-Create a structured review with:
-- Executive summary
-- Critical issues (must fix)
-- Warnings (should fix)
-- Suggestions (nice to have)
-- Positive feedback
+        Args:
+            pr_url: URL of the PR/MR
+            platform: Platform name (auto-detected if not provided)
+            semaphore: Shared agent semaphore when reviewing in a batch
+            refresh: Re-fetch the PR and skip the semantic review cache
 
-Make it actionable, specific, and developer-friendly.
-""",
-                agent=synthesizer,
-                expected_output="Complete, structured code review report",
-                context=[analysis_task, retrieval_task, critic_task]
+        Returns:
+            Review results
+        """
+        try:
+            platform, pr, context = await asyncio.to_thread(
+                self._load_pull_request, pr_url, platform, refresh
             )
 
-            # Create crew
-            crew = Crew(
-                agents=[analyzer, retriever, critic, synthesizer],
-                tasks=[analysis_task, retrieval_task, critic_task, synthesis_task],
-                process=Process.sequential,
-                verbose=True
+            # Short-circuit near-duplicate reviews
+            cached_review, cache_key_text, cache_embedding, fingerprint = await asyncio.to_thread(
+                self._lookup_cached_review, pr, context, refresh
             )
+            if cached_review is not None:
+                logger.info("Returning cached review")
+                return {
+                    'success': True,
+                    'pr_info': context['pr_info'],
+                    'review': cached_review,
+                    'platform': platform,
+                    'url': pr_url,
+                    'cached': True
+                }
 
             # Execute review
             logger.info("Starting crew execution...")
-            result = crew.kickoff()
+            review = await self._run_review_pipeline(pr, context, semaphore)
+
+            if self.semantic_cache:
+                await asyncio.to_thread(
+                    self.semantic_cache.store,
+                    cache_embedding,
+                    cache_key_text,
+                    review,
+                    fingerprint,
+                    pr.repository,
+                    metadata={'url': pr_url, 'platform': platform}
+                )
 
             logger.info("Review complete!")
 
             return {
                 'success': True,
                 'pr_info': context['pr_info'],
-                'review': str(result),
+                'review': review,
                 'platform': platform,
-                'url': pr_url
+                'url': pr_url,
+                'cached': False
             }
 
         except Exception as e:
-            logger.error(f"Error during review: {e}", exc_info=True)
+            logger.error("Error during review: %s", e, exc_info=True)
             return {
                 'success': False,
                 'error': str(e),
                 'url': pr_url
             }
 
+    def review_pull_request(
+        self,
+        pr_url: str,
+        platform: Optional[str] = None,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Review a pull request using the agent crew.
+
+        Args:
+            pr_url: URL of the PR/MR
+            platform: Platform name (auto-detected if not provided)
+            refresh: Re-fetch the PR and skip the semantic review cache
+
+        Returns:
+            Review results
+        """
+        return asyncio.run(self._review_pull_request_async(pr_url, platform, refresh=refresh))
+
+    async def review_pull_requests(
+        self,
+        urls: List[str],
+        max_concurrent: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Review several pull requests concurrently.
+
+        At most max_concurrent reviews run at once, and all reviews share one
+        agent semaphore so total LLM concurrency stays bounded. A failing PR
+        yields an error result instead of aborting the batch.
+
+        Args:
+            urls: PR/MR URLs
+            max_concurrent: Maximum concurrent reviews (defaults to settings)
+
+        Returns:
+            Review results in the same order as urls
+        """
+        review_semaphore = asyncio.Semaphore(max_concurrent or settings.max_concurrent_reviews)
+        agent_semaphore = asyncio.Semaphore(settings.max_parallel_agents)
+
+        async def _one(url: str) -> Dict[str, Any]:
+            async with review_semaphore:
+                return await self._review_pull_request_async(url, semaphore=agent_semaphore)
+
+        results = await asyncio.gather(*[_one(url) for url in urls], return_exceptions=True)
+
+        return [
+            {'success': False, 'error': str(result), 'url': url}
+            if isinstance(result, BaseException) else result
+            for url, result in zip(urls, results)
+        ]
+
+    def review_pull_request_stream(
+        self,
+        pr_url: str,
+        platform: Optional[str] = None,
+        refresh: bool = False,
+        info: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Review a pull request, streaming the final report as it is generated.
+
+        The analyzer, retriever and critic stages run as in
+        review_pull_request since later stages consume their full output;
+        only the synthesizer's LLM call is streamed.
+
+        Args:
+            pr_url: URL of the PR/MR
+            platform: Platform name (auto-detected if not provided)
+            refresh: Re-fetch the PR and skip the semantic review cache
+            info: Optional dict filled with the 'pr_info', 'platform' and
+                'cached' fields of review_pull_request's result once the PR
+                is loaded
+
+        Yields:
+            Chunks of the review text
+        """
+        platform, pr, context = self._load_pull_request(pr_url, platform, refresh)
+
+        cached_review, cache_key_text, cache_embedding, fingerprint = self._lookup_cached_review(pr, context, refresh)
+        if info is not None:
+            info.update(
+                pr_info=context['pr_info'],
+                platform=platform,
+                cached=cached_review is not None
+            )
+        if cached_review is not None:
+            logger.info("Returning cached review")
+            yield cached_review
+            return
+
+        logger.info("Starting crew execution...")
+        semaphore = asyncio.Semaphore(settings.max_parallel_agents)
+        stage_results = asyncio.run(self._run_analysis_stages(pr, context, semaphore))
+
+        messages = [
+            SystemMessage(content=SYNTHESIZER_AGENT_PROMPT),
+            HumanMessage(content=self._render_synthesis(pr, stage_results))
+        ]
+
+        chunks = []
+        for chunk in self.chat_llm.stream(messages):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield chunk.content
+
+        review = "".join(chunks)
+        if self.semantic_cache:
+            self.semantic_cache.store(
+                cache_embedding,
+                cache_key_text,
+                review,
+                fingerprint=fingerprint,
+                repository=pr.repository,
+                metadata={'url': pr_url, 'platform': platform}
+            )
+
+        logger.info("Review complete!")
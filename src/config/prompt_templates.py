@@ -0,0 +1,130 @@
+"""
+Precompiled task description templates for the review agents.
+"""
+from jinja2 import Environment, DictLoader, StrictUndefined
+
+# Shared scaffolding used by several task templates
+_MACROS = """
+{%- macro numbered(items) -%}
+{% for item in items %}
+{{ loop.index }}. {{ item }}
+{% endfor %}
+{%- endmacro -%}
+
+{%- macro bulleted(items) -%}
+{% for item in items %}
+- {{ item }}
+{% endfor %}
+{%- endmacro -%}
+"""
+
+_ANALYSIS = """{% from "macros" import numbered, bulleted %}
+Analyze the following code changes and identify potential issues:
+
+PR Title: {{ pr.title }}
+Description: {{ pr.description }}
+Language: {{ pr.language }}
+Files Changed: {{ pr.changed_files }}
+Additions: {{ pr.additions }} / Deletions: {{ pr.deletions }}
+
+Files:
+{{ bulleted(files) }}
+Focus on:
+{{ numbered(focus_areas) }}
+Provide specific file and line references where possible.
+"""
+
+_RETRIEVAL = """{% from "macros" import bulleted %}
+Based on the code changes in this {{ pr.language or 'unknown language' }} PR,
+retrieve relevant best practices and patterns from the knowledge base.
+
+PR Title: {{ pr.title }}
+Change Summary: {{ change_summary.files_changed }} files, +{{ change_summary.total_added }} / -{{ change_summary.total_removed }} lines
+
+Focus areas:
+{{ bulleted(guideline_areas) }}
+Return the most relevant guidelines that apply to this review.
+"""
+
+_CRITIC = """{% from "macros" import numbered %}
+Review the identified issues from the analyzer and evaluate each one:
+
+Analyzer findings:
+{{ analysis_result }}
+
+For each issue, assess:
+{{ numbered(criteria) }}
+Assign a quality score (0.0-1.0) to each suggestion.
+Filter out suggestions with score < {{ min_score }}.
+Provide reasoning for your evaluations.
+"""
+
+_SYNTHESIS = """{% from "macros" import bulleted %}
+Create a comprehensive code review report for this PR.
+
+PR: {{ pr.title }}
+
+Validated issues from the critic:
+{{ critic_result }}
+
+Relevant best practices from the retriever:
+{{ retrieval_result }}
+
+Original analysis insights:
+{{ analysis_result }}
+
+Create a structured review with:
+{{ bulleted(sections) }}
+Make it actionable, specific, and developer-friendly.
+"""
+
+_env = Environment(
+    loader=DictLoader({
+        "macros": _MACROS,
+        "analysis": _ANALYSIS,
+        "retrieval": _RETRIEVAL,
+        "critic": _CRITIC,
+        "synthesis": _SYNTHESIS
+    }),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    undefined=StrictUndefined,
+    auto_reload=False,
+    cache_size=64
+)
+
+ANALYSIS_TMPL = _env.get_template("analysis")
+RETRIEVAL_TMPL = _env.get_template("retrieval")
+CRITIC_TMPL = _env.get_template("critic")
+SYNTHESIS_TMPL = _env.get_template("synthesis")
+
+ANALYSIS_FOCUS_AREAS = [
+    "Security vulnerabilities",
+    "Performance issues",
+    "Potential bugs",
+    "Code quality concerns",
+    "Best practice violations"
+]
+
+RETRIEVAL_GUIDELINE_AREAS = [
+    "Security guidelines",
+    "Performance optimization",
+    "Code quality standards",
+    "Language-specific best practices"
+]
+
+CRITIC_CRITERIA = [
+    "Is this a real issue or false positive?",
+    "Is the severity level appropriate?",
+    "Is the suggestion actionable and specific?",
+    "Is it directly related to the changes?"
+]
+
+SYNTHESIS_SECTIONS = [
+    "Executive summary",
+    "Critical issues (must fix)",
+    "Warnings (should fix)",
+    "Suggestions (nice to have)",
+    "Positive feedback"
+]
@@ -15,7 +15,7 @@ class Settings(BaseSettings):
     )
 
     # OpenAI Configuration
-    openai_api_key: str
+    openai_api_key: Optional[str] = None
     openai_model: str = "gpt-5.1"
     openai_temperature: float = 0.1
 
@@ -36,13 +36,23 @@ class Settings(BaseSettings):
 
     # Vector Store Configuration
     chroma_persist_directory: str = "./data/vector_db"
+    chroma_add_batch_size: int = 100  # documents per Chroma write; 50-250 works well
+    chroma_max_write_workers: int = 4
     embedding_model: str = "text-embedding-3-small"
+    embedding_dimensions: Optional[int] = None  # shortened text-embedding-3 vectors, e.g. 512
+    embedding_batch_size: int = 128
+    embedding_max_concurrency: int = 8
 
     # Application Configuration
     log_level: str = "INFO"
     cache_enabled: bool = True
     cache_directory: str = "./data/cache"
 
+    # Semantic Cache Configuration
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.92  # minimum cosine similarity
+    semantic_cache_ttl: int = 86400  # seconds
+
     # Review Configuration
     review_mode: Literal["quick", "standard", "deep"] = "standard"
     max_issues_per_category: int = 10
@@ -52,18 +62,50 @@ class Settings(BaseSettings):
     # Agent Configuration
     max_agent_iterations: int = 5
     agent_timeout: int = 300  # seconds
+    max_parallel_agents: int = 2
+    max_concurrent_reviews: int = 4
+    openai_max_retries: int = 3
 
     # RAG Configuration
-    chunk_size: int = 1000
-    chunk_overlap: int = 200
+    chunk_size: int = 512  # tokens
+    chunk_overlap: int = 64  # tokens
     retrieval_k: int = 5
+    rerank_enabled: bool = False  # downloads the re-ranker model (~1.1 GB) on first use
+    rerank_model: str = "BAAI/bge-reranker-base"
+    rerank_candidates: int = 20  # bi-encoder candidates fed to the re-ranker
+    rerank_top_k: int = 3
+    indexer_batch_size: int = 200
+
+    # HTTP Configuration
+    http_max_connections: int = 20
+    http_timeout: float = 30.0  # seconds
 
     # Rate Limiting
     github_rate_limit: int = 50  # requests per hour
     gitlab_rate_limit: int = 50
     bitbucket_rate_limit: int = 50
+    openai_rpm: int = 500  # requests per minute
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """
+    Get the global settings instance, loading it on first access.
+
+    Returns:
+        Application settings
+    """
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
 
 
-# Global settings instance
-settings = Settings()
+def __getattr__(name: str):
+    """Resolve the module-level ``settings`` attribute lazily."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -2,12 +2,27 @@
 Base adapter for platform integrations.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Optional, Tuple, Type
 from dataclasses import dataclass
 from datetime import datetime
+from importlib import import_module, metadata
+from urllib.parse import urlsplit, urlunsplit
+import asyncio
+import functools
+import logging
+import threading
+import time
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Maximum number of fetched PRs each adapter keeps in memory
+PR_CACHE_SIZE = 16
+# Seconds an in-memory copy is reused; it is not checked against the platform
+PR_CACHE_TTL = 60
+
+
+@dataclass(slots=True)
 class FileChange:
     """Represents a file change in a PR/MR."""
     filename: str
@@ -19,7 +34,7 @@ class FileChange:
     previous_filename: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PullRequest:
     """Unified representation of a PR/MR across platforms."""
     platform: str  # github, gitlab, bitbucket
@@ -44,7 +59,6 @@ class PullRequest:
     language: Optional[str] = None
 
 
-
 class BasePlatformAdapter(ABC):
     """Abstract base class for platform adapters."""
 
@@ -53,19 +67,108 @@ class BasePlatformAdapter(ABC):
         self.token = token
         self.extra_config = kwargs
 
+        # Recently fetched PRs by normalized URL, least recently used first,
+        # with the time.monotonic() of each fetch
+        self._pr_cache: "OrderedDict[str, Tuple[float, PullRequest]]" = OrderedDict()
+        self._pr_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Canonicalize a PR/MR URL for use as a cache key."""
+        parts = urlsplit(url.strip())
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
+    def get_pull_request(
+        self,
+        url: str,
+        parsed: Optional[Dict[str, Any]] = None,
+        refresh: bool = False
+    ) -> PullRequest:
+        """
+        Get a PR/MR, reusing an in-memory fetch of the same URL made within
+        the last PR_CACHE_TTL seconds.
+
+        Args:
+            url: The URL of the PR/MR
+            parsed: Pre-parsed URL components (parsed from url if not provided)
+            refresh: Always fetch from the platform, replacing any cached copy
+
+        Returns:
+            PullRequest object with all details
+        """
+        key = self._normalize_url(url)
+
+        if not refresh:
+            with self._pr_cache_lock:
+                entry = self._pr_cache.get(key)
+                if entry is not None and time.monotonic() - entry[0] < PR_CACHE_TTL:
+                    self._pr_cache.move_to_end(key)
+                    return entry[1]
+
+        pr = self.fetch_pull_request(url, parsed)
+
+        with self._pr_cache_lock:
+            self._pr_cache[key] = (time.monotonic(), pr)
+            self._pr_cache.move_to_end(key)
+            while len(self._pr_cache) > PR_CACHE_SIZE:
+                self._pr_cache.popitem(last=False)
+
+        return pr
+
     @abstractmethod
-    def fetch_pull_request(self, url: str) -> PullRequest:
+    def fetch_pull_request(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> PullRequest:
         """
         Fetch PR/MR details from the platform.
 
         Args:
             url: The URL of the PR/MR
+            parsed: Pre-parsed URL components in the shape returned by
+                parse_url (parsed from url if not provided)
 
         Returns:
             PullRequest object with all details
         """
         pass
 
+    async def fetch_pull_request_async(
+        self,
+        url: str,
+        parsed: Optional[Dict[str, Any]] = None
+    ) -> PullRequest:
+        """
+        Fetch PR/MR details without blocking the event loop.
+
+        The default runs the blocking fetch_pull_request in a worker thread.
+        Adapters with a native async implementation override this and use
+        the shared client from src.data_preparation.http_client.
+
+        Args:
+            url: The URL of the PR/MR
+            parsed: Pre-parsed URL components (parsed from url if not provided)
+
+        Returns:
+            PullRequest object with all details
+        """
+        return await asyncio.to_thread(self.fetch_pull_request, url, parsed)
+
+    def get_updated_at(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Get the last-updated timestamp of a PR/MR with a lightweight call.
+
+        Used to validate cached PR data. Adapters that cannot provide it
+        cheaply return None; their PRs are then never cached on disk, and
+        only get_pull_request's in-memory copy (at most PR_CACHE_TTL seconds
+        old) is reused.
+
+        Args:
+            url: The URL of the PR/MR
+            parsed: Pre-parsed URL components (parsed from url if not provided)
+
+        Returns:
+            ISO-8601 timestamp, or None if unavailable
+        """
+        return None
+
     @abstractmethod
     def get_file_content(self, repo: str, filepath: str, ref: str) -> str:
         """
@@ -112,3 +215,70 @@ class BasePlatformAdapter(ABC):
         """Validate that the token is valid."""
         return self.token is not None
 
+
+# Platform name -> adapter class, populated by @register
+_REGISTRY: Dict[str, Type[BasePlatformAdapter]] = {}
+
+# Built-in adapters, imported on first use to keep their SDKs off the import path
+_BUILTIN_ADAPTER_MODULES = {
+    'github': 'src.data_preparation.github_adapter',
+    'gitlab': 'src.data_preparation.gitlab_adapter',
+    'bitbucket': 'src.data_preparation.bitbucket_adapter'
+}
+
+# Entry-point group for third-party adapters
+ADAPTER_ENTRY_POINT_GROUP = 'pr_reviewer.adapters'
+
+
+def register(name: str) -> Callable[[Type[BasePlatformAdapter]], Type[BasePlatformAdapter]]:
+    """
+    Class decorator registering a platform adapter under a name.
+
+    Args:
+        name: Platform name (e.g. "github")
+
+    Returns:
+        Decorator that registers and returns the class
+    """
+    def decorator(cls: Type[BasePlatformAdapter]) -> Type[BasePlatformAdapter]:
+        _REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+def _discover_adapter(name: str):
+    """Import the module providing an adapter so it registers itself."""
+    module_name = _BUILTIN_ADAPTER_MODULES.get(name)
+    if module_name:
+        import_module(module_name)
+        return
+
+    for entry_point in metadata.entry_points(group=ADAPTER_ENTRY_POINT_GROUP):
+        if entry_point.name == name:
+            cls = entry_point.load()
+            _REGISTRY.setdefault(name, cls)
+            logger.info(f"Loaded adapter plugin: {name} ({entry_point.value})")
+            return
+
+
+@functools.lru_cache(maxsize=None)
+def get_adapter(name: str) -> BasePlatformAdapter:
+    """
+    Get the shared adapter instance for a platform.
+
+    Adapters are instantiated on first use and shared process-wide.
+
+    Args:
+        name: Platform name
+
+    Returns:
+        Platform adapter instance
+    """
+    if name not in _REGISTRY:
+        _discover_adapter(name)
+
+    cls = _REGISTRY.get(name)
+    if cls is None:
+        raise ValueError(f"Unsupported platform: {name}")
+
+    return cls()
@@ -1,18 +1,104 @@
 """
 Bitbucket adapter for fetching PR data.
 """
+import asyncio
+import functools
+import inspect
 import re
-from typing import Dict, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
 from atlassian import Bitbucket
+import httpx
 import logging
 
-from src.data_preparation.base_adapter import BasePlatformAdapter, PullRequest, FileChange
+from src.data_preparation.base_adapter import BasePlatformAdapter, PullRequest, FileChange, register
+from src.data_preparation.http_client import get_async_client, run_sync
+from src.utils.timestamps import parse_iso
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# The number must end the URL or be followed by a sub-page, query or fragment
+_BB_PR_RE = re.compile(r"bitbucket\.org/([^/]+)/([^/]+)/pull-requests/(\d+)(?:[/?#]|$)")
 
+DIFFSTAT_PAGE_LEN = 500
+
+# Bitbucket diffstat status -> FileChange status
+DIFFSTAT_STATUS = {
+    'added': 'added',
+    'removed': 'deleted',
+    'modified': 'modified',
+    'renamed': 'renamed'
+}
+
+# Marks _requires_client methods that re-raise instead of returning a fallback
+_RAISE = object()
+
+
+def _requires_client(action: str, fallback: Any = _RAISE) -> Callable:
+    """
+    Decorate an adapter method that needs an initialized Bitbucket client.
+
+    Without credentials the method is not called: a ValueError is raised,
+    or fallback is returned if one is given. Errors raised by the method
+    are logged once here and then re-raised (or replaced by fallback).
+
+    Args:
+        action: What the method does, for log messages (e.g. "fetching Bitbucket PR")
+        fallback: Value to return instead of raising
+
+    Returns:
+        Method decorator (works on sync and async methods)
+    """
+    def missing_client():
+        if fallback is _RAISE:
+            raise ValueError("Bitbucket client not initialized. Provide credentials.")
+        logger.error("Bitbucket client not initialized.")
+        return fallback
+
+    def decorator(method: Callable) -> Callable:
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                if self.client is None:
+                    return missing_client()
+                try:
+                    return await method(self, *args, **kwargs)
+                except Exception as e:
+                    logger.error(f"Error {action}: {e}")
+                    if fallback is _RAISE:
+                        raise
+                    return fallback
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.client is None:
+                return missing_client()
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error {action}: {e}")
+                if fallback is _RAISE:
+                    raise
+                return fallback
+        return wrapper
+
+    return decorator
+
+
+@functools.lru_cache(maxsize=None)
+def _bitbucket_client(url: str, username: str, password: str) -> Bitbucket:
+    """Create the Bitbucket client for a set of credentials, once per process."""
+    return Bitbucket(
+        url=url,
+        username=username,
+        password=password,
+        cloud=True
+    )
+
+
+@register('bitbucket')
 class BitbucketAdapter(BasePlatformAdapter):
     """Adapter for Bitbucket API."""
 
@@ -29,14 +115,13 @@ class BitbucketAdapter(BasePlatformAdapter):
 
         if not self.username or not self.password:
             logger.warning("No Bitbucket credentials provided.")
-            self.client = None
-        else:
-            self.client = Bitbucket(
-                url=settings.bitbucket_url,
-                username=self.username,
-                password=self.password,
-                cloud=True
-            )
+
+    @property
+    def client(self) -> Optional[Bitbucket]:
+        """Bitbucket client shared by adapters with the same credentials (None without them)."""
+        if not self.username or not self.password:
+            return None
+        return _bitbucket_client(settings.bitbucket_url, self.username, self.password)
 
     def parse_url(self, url: str) -> Dict[str, str]:
         """
@@ -44,8 +129,7 @@ class BitbucketAdapter(BasePlatformAdapter):
 
         Example: https://bitbucket.org/owner/repo/pull-requests/123
         """
-        pattern = r"bitbucket\.org/([^/]+)/([^/]+)/pull-requests/(\d+)"
-        match = re.search(pattern, url)
+        match = _BB_PR_RE.search(url)
 
         if not match:
             raise ValueError(f"Invalid Bitbucket PR URL: {url}")
@@ -56,87 +140,110 @@ class BitbucketAdapter(BasePlatformAdapter):
             "pr_number": int(match.group(3))
         }
 
-    def fetch_pull_request(self, url: str) -> PullRequest:
+    async def _get_json(self, client: httpx.AsyncClient, url: str, **params) -> Dict[str, Any]:
+        """GET a REST API URL and decode the JSON body."""
+        response = await client.get(url, auth=(self.username, self.password), params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_diffstat(self, client: httpx.AsyncClient, pr_url: str) -> List[Dict[str, Any]]:
+        """Get all diffstat entries of a PR, following pagination."""
+        entries: List[Dict[str, Any]] = []
+        page = await self._get_json(client, f"{pr_url}/diffstat", pagelen=DIFFSTAT_PAGE_LEN)
+        entries.extend(page.get('values', []))
+
+        while page.get('next'):
+            page = await self._get_json(client, page['next'])
+            entries.extend(page.get('values', []))
+
+        return entries
+
+    def fetch_pull_request(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> PullRequest:
         """Fetch PR details from Bitbucket."""
-        if not self.client:
-            raise ValueError("Bitbucket client not initialized. Provide credentials.")
+        return run_sync(self.fetch_pull_request_async(url, parsed))
+
+    @_requires_client("fetching Bitbucket PR")
+    async def fetch_pull_request_async(
+        self,
+        url: str,
+        parsed: Optional[Dict[str, Any]] = None
+    ) -> PullRequest:
+        """
+        Fetch PR details from the Bitbucket Cloud REST API.
 
-        try:
-            parsed = self.parse_url(url)
-            workspace = parsed['workspace']
-            repo = parsed['repo']
-            pr_number = parsed['pr_number']
-
-            logger.info(f"Fetching Bitbucket PR: {workspace}/{repo}#{pr_number}")
-
-            # Note: The atlassian-python-api library has limited Bitbucket Cloud support
-            # This is a simplified implementation
-            pr_data = self.client.get_pullrequest(
-                workspace, repo, pr_number
-            )
-
-            # Get file changes (simplified - actual implementation would need more API calls)
-            files_changed = []
-
-            pull_request = PullRequest(
-                platform="bitbucket",
-                id=str(pr_data.get('id', pr_number)),
-                number=pr_number,
-                title=pr_data.get('title', ''),
-                description=pr_data.get('description', ''),
-                author=pr_data.get('author', {}).get('display_name', 'unknown'),
-                created_at=datetime.fromisoformat(
-                    pr_data.get('created_on', '').replace('Z', '+00:00')
-                ) if pr_data.get('created_on') else datetime.now(),
-                updated_at=datetime.fromisoformat(
-                    pr_data.get('updated_on', '').replace('Z', '+00:00')
-                ) if pr_data.get('updated_on') else datetime.now(),
-                state=pr_data.get('state', 'unknown'),
-                source_branch=pr_data.get('source', {}).get('branch', {}).get('name', ''),
-                target_branch=pr_data.get('destination', {}).get('branch', {}).get('name', ''),
-                repository=f"{workspace}/{repo}",
-                url=url,
-                files_changed=files_changed,
-                commits_count=0,  # Would need additional API call
-                additions=0,
-                deletions=0,
-                changed_files=len(files_changed),
-                labels=[],
-                language=None
-            )
-
-            logger.info(f"Successfully fetched Bitbucket PR")
-            return pull_request
-
-        except Exception as e:
-            logger.error(f"Error fetching Bitbucket PR: {e}")
-            raise
+        The PR and its diffstat are requested concurrently.
+        """
+        parsed = parsed or self.parse_url(url)
+        workspace = parsed['workspace']
+        repo = parsed['repo']
+        pr_number = parsed['pr_number']
 
-    def get_file_content(self, repo: str, filepath: str, ref: str) -> str:
-        """Get file content from Bitbucket."""
-        if not self.client:
-            raise ValueError("Bitbucket client not initialized.")
+        logger.info(f"Fetching Bitbucket PR: {workspace}/{repo}#{pr_number}")
 
-        try:
-            # Implementation would depend on workspace/repo parsing
-            raise NotImplementedError("Bitbucket file content retrieval not fully implemented")
+        client = get_async_client()
+        pr_api_url = (
+            f"{settings.bitbucket_url.rstrip('/')}/2.0/repositories/"
+            f"{workspace}/{repo}/pullrequests/{pr_number}"
+        )
 
-        except Exception as e:
-            logger.error(f"Error fetching file content: {e}")
-            raise
+        # Get PR and per-file stats
+        pr_data, diffstat = await asyncio.gather(
+            self._get_json(client, pr_api_url),
+            self._get_diffstat(client, pr_api_url)
+        )
 
-    def post_review_comment(self, pr_url: str, comment: str) -> bool:
-        """Post a review comment on Bitbucket PR."""
-        if not self.client:
-            logger.error("Bitbucket client not initialized.")
-            return False
+        # Get file changes (patches are not part of the diffstat)
+        files_changed = []
+        for entry in diffstat:
+            new_path = (entry.get('new') or {}).get('path')
+            old_path = (entry.get('old') or {}).get('path')
+            status = DIFFSTAT_STATUS.get(entry.get('status'), 'modified')
+
+            files_changed.append(FileChange(
+                filename=new_path or old_path,
+                status=status,
+                additions=entry.get('lines_added', 0),
+                deletions=entry.get('lines_removed', 0),
+                changes=entry.get('lines_added', 0) + entry.get('lines_removed', 0),
+                patch=None,
+                previous_filename=old_path if status == 'renamed' else None
+            ))
+
+        pull_request = PullRequest(
+            platform="bitbucket",
+            id=str(pr_data.get('id', pr_number)),
+            number=pr_number,
+            title=pr_data.get('title', ''),
+            description=pr_data.get('description', ''),
+            author=pr_data.get('author', {}).get('display_name', 'unknown'),
+            created_at=parse_iso(pr_data['created_on']) if pr_data.get('created_on') else datetime.now(),
+            updated_at=parse_iso(pr_data['updated_on']) if pr_data.get('updated_on') else datetime.now(),
+            state=pr_data.get('state', 'unknown'),
+            source_branch=pr_data.get('source', {}).get('branch', {}).get('name', ''),
+            target_branch=pr_data.get('destination', {}).get('branch', {}).get('name', ''),
+            repository=f"{workspace}/{repo}",
+            url=url,
+            files_changed=files_changed,
+            commits_count=0,  # Would need additional API call
+            additions=sum(f.additions for f in files_changed),
+            deletions=sum(f.deletions for f in files_changed),
+            changed_files=len(files_changed),
+            labels=[],
+            language=None
+        )
 
-        try:
-            # Implementation would require proper API endpoint
-            logger.warning("Bitbucket comment posting not fully implemented")
-            return False
+        logger.info(f"Successfully fetched Bitbucket PR with {len(files_changed)} files changed")
+        return pull_request
 
-        except Exception as e:
-            logger.error(f"Error posting review comment: {e}")
-            return False
+    @_requires_client("fetching file content")
+    def get_file_content(self, repo: str, filepath: str, ref: str) -> str:
+        """Get file content from Bitbucket."""
+        # Implementation would depend on workspace/repo parsing
+        raise NotImplementedError("Bitbucket file content retrieval not fully implemented")
 
+    @_requires_client("posting review comment", fallback=False)
+    def post_review_comment(self, pr_url: str, comment: str) -> bool:
+        """Post a review comment on Bitbucket PR."""
+        # Implementation would require proper API endpoint
+        logger.warning("Bitbucket comment posting not fully implemented")
+        return False
@@ -1,16 +1,62 @@
 """
 Diff parser for extracting meaningful code changes.
 """
+import itertools
 import re
-from typing import List, Dict, Tuple
+import sys
+from collections import Counter
+from typing import Any, List, Dict, Set, Tuple, Optional
 from dataclasses import dataclass
-from unidiff import PatchSet
 import logging
 
-logger = logging.getLogger(__name__)
+from src.data_preparation.base_adapter import FileChange
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+_HUNK_RE = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+_SOURCE_FILE_RE = re.compile(r'^--- (?:a/)?([^\t]+)')
+_TARGET_FILE_RE = re.compile(r'^\+\+\+ (?:b/)?([^\t]+)')
+
+# Function definition patterns for different languages. Kept separate per
+# language: a single alternation would let e.g. the Java pattern match
+# ordinary Python call lines.
+_FUNCTION_PATTERNS = {
+    'python': re.compile(r'^\s*def\s+(\w+)\s*\('),
+    'javascript': re.compile(r'^\s*(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s*)?\()'),
+    'java': re.compile(r'^\s*(?:public|private|protected)?\s*(?:static\s+)?[\w<>]+\s+(\w+)\s*\('),
+    'go': re.compile(r'^\s*func\s+(?:\(\w+\s+\*?\w+\)\s+)?(\w+)\s*\('),
+}
+
+# Cheap prefix checks that reject most lines before running the regex.
+# Java declarations have no keyword prefix, so only the first character
+# (which must be a word character or '<') is checked for it.
+_FUNCTION_PREFIXES = {
+    'python': ('def',),
+    'javascript': ('function', 'const'),
+    'go': ('func',),
+}
+
+_LANG_BY_EXTENSION = {
+    'py': 'python',
+    'js': 'javascript',
+    'ts': 'javascript',
+    'java': 'java',
+    'go': 'go'
+}
+
+
+def file_extension(file_path: str) -> str:
+    """
+    Get a file's extension ('' if it has none).
+
+    Extensions are interned: the same few recur across every hunk and are
+    used as dict and Counter keys, so lookups can compare by identity.
+    """
+    _, dot, extension = file_path.rpartition('.')
+    return sys.intern(extension) if dot else ''
+
+
+@dataclass(slots=True)
 class CodeHunk:
     """Represents a hunk of code changes."""
     file_path: str
@@ -23,54 +69,134 @@ class CodeHunk:
     context_lines: List[Tuple[int, str]]
 
 
+def _find_functions(hunk: CodeHunk, language: str) -> Set[str]:
+    """Find names of functions defined in a hunk's added and context lines."""
+    pattern = _FUNCTION_PATTERNS[language]
+    prefixes = _FUNCTION_PREFIXES.get(language)
+    functions = set()
+
+    for _, line_content in itertools.chain(hunk.added_lines, hunk.context_lines):
+        # Every pattern needs an opening parenthesis
+        if '(' not in line_content:
+            continue
+
+        stripped = line_content.lstrip()
+        if prefixes is not None:
+            if not stripped.startswith(prefixes):
+                continue
+        elif not stripped or not (stripped[0].isalnum() or stripped[0] in '_<'):
+            continue
+
+        match = pattern.match(line_content)
+        if match:
+            # Get first non-None group
+            func_name = next((g for g in match.groups() if g), None)
+            if func_name:
+                functions.add(func_name)
+
+    return functions
+
+
 class DiffParser:
     """Parse and analyze diffs."""
 
     @staticmethod
-    def parse_patch(patch_text: str) -> List[CodeHunk]:
+    def parse_patch(
+        patch_text: str,
+        max_hunks: Optional[int] = None,
+        max_added_lines_per_hunk: Optional[int] = None,
+        file_path: str = ''
+    ) -> List[CodeHunk]:
         """
         Parse a unified diff patch.
 
         Args:
             patch_text: Unified diff format text
+            max_hunks: Stop after this many hunks (all hunks if None)
+            max_added_lines_per_hunk: Keep at most this many added lines per
+                hunk (all lines if None). Hunk counts are unaffected.
+            file_path: Path to use for hunks that have no ---/+++ file
+                header, as in the per-file patches platforms return
 
         Returns:
             List of CodeHunk objects
         """
-        if not patch_text:
+        # Binary, rename-only and mode-only diffs have no hunk headers
+        if not patch_text or '@@ ' not in patch_text:
             return []
 
         try:
-            patch_set = PatchSet(patch_text)
-            hunks = []
-
-            for patched_file in patch_set:
-                file_path = patched_file.path
-
-                for hunk in patched_file:
-                    added_lines = []
-                    removed_lines = []
-                    context_lines = []
-
-                    for line in hunk:
-                        if line.is_added:
-                            added_lines.append((line.target_line_no, line.value))
-                        elif line.is_removed:
-                            removed_lines.append((line.source_line_no, line.value))
-                        else:  # context
-                            context_lines.append((line.target_line_no, line.value))
-
-                    code_hunk = CodeHunk(
+            # Common case: a platform's per-file patch holding a single hunk
+            if patch_text.startswith('@@ ') and '\n@@ ' not in patch_text:
+                return DiffParser._parse_single_hunk(patch_text, max_added_lines_per_hunk, file_path)
+
+            hunks: List[CodeHunk] = []
+            hunk: Optional[CodeHunk] = None
+            source_path: str = ''
+            old_ln: int = 0
+            new_ln: int = 0
+            # Lines still expected in the current hunk body, per the header
+            old_left: int = 0
+            new_left: int = 0
+
+            for line in patch_text.split('\n'):
+                if hunk is not None and (old_left > 0 or new_left > 0):
+                    tag = line[:1]
+                    if tag == '+':
+                        if max_added_lines_per_hunk is None or len(hunk.added_lines) < max_added_lines_per_hunk:
+                            hunk.added_lines.append((new_ln, line[1:]))
+                        new_ln += 1
+                        new_left -= 1
+                    elif tag == '-':
+                        hunk.removed_lines.append((old_ln, line[1:]))
+                        old_ln += 1
+                        old_left -= 1
+                    elif tag == '\\':  # "\ No newline at end of file"
+                        pass
+                    else:  # context (an empty line is a context line with no content)
+                        hunk.context_lines.append((new_ln, line[1:]))
+                        old_ln += 1
+                        new_ln += 1
+                        old_left -= 1
+                        new_left -= 1
+                    continue
+
+                header = _HUNK_RE.match(line)
+                if header:
+                    if hunk is not None:
+                        hunks.append(hunk)
+                        if max_hunks is not None and len(hunks) >= max_hunks:
+                            return hunks
+
+                    old_ln = int(header.group(1))
+                    old_left = int(header.group(2) or 1)
+                    new_ln = int(header.group(3))
+                    new_left = int(header.group(4) or 1)
+                    hunk = CodeHunk(
                         file_path=file_path,
-                        old_start=hunk.source_start,
-                        old_count=hunk.source_length,
-                        new_start=hunk.target_start,
-                        new_count=hunk.target_length,
-                        added_lines=added_lines,
-                        removed_lines=removed_lines,
-                        context_lines=context_lines
+                        old_start=old_ln,
+                        old_count=old_left,
+                        new_start=new_ln,
+                        new_count=new_left,
+                        added_lines=[],
+                        removed_lines=[],
+                        context_lines=[]
                     )
-                    hunks.append(code_hunk)
+                    continue
+
+                match = _SOURCE_FILE_RE.match(line)
+                if match:
+                    source_path = match.group(1)
+                    continue
+
+                match = _TARGET_FILE_RE.match(line)
+                if match:
+                    target_path = match.group(1)
+                    # Deleted files have /dev/null as their target
+                    file_path = source_path if target_path == '/dev/null' else target_path
+
+            if hunk is not None and (max_hunks is None or len(hunks) < max_hunks):
+                hunks.append(hunk)
 
             return hunks
 
@@ -79,61 +205,120 @@ class DiffParser:
             return []
 
     @staticmethod
-    def extract_functions(hunks: List[CodeHunk]) -> Dict[str, List[str]]:
+    def _parse_single_hunk(
+        patch_text: str,
+        max_added_lines_per_hunk: Optional[int],
+        file_path: str
+    ) -> List[CodeHunk]:
         """
-        Extract function/method names from changed code.
+        Parse a headerless patch known to contain exactly one hunk.
+
+        Everything after the @@ line is hunk body, so lines are classified
+        without the per-line hunk and header bookkeeping of parse_patch.
+        """
+        header_end = patch_text.find('\n')
+        if header_end == -1:
+            header_end = len(patch_text)
+
+        header = _HUNK_RE.match(patch_text, 0, header_end)
+        if not header:
+            return []
+
+        old_ln = old_start = int(header.group(1))
+        new_ln = new_start = int(header.group(3))
+        added_lines: List[Tuple[int, str]] = []
+        removed_lines: List[Tuple[int, str]] = []
+        context_lines: List[Tuple[int, str]] = []
+
+        body = patch_text[header_end + 1:]
+        if body.endswith('\n'):
+            body = body[:-1]
+
+        for line in body.split('\n') if body else ():
+            tag = line[:1]
+            if tag == '+':
+                if max_added_lines_per_hunk is None or len(added_lines) < max_added_lines_per_hunk:
+                    added_lines.append((new_ln, line[1:]))
+                new_ln += 1
+            elif tag == '-':
+                removed_lines.append((old_ln, line[1:]))
+                old_ln += 1
+            elif tag == '\\':  # "\ No newline at end of file"
+                pass
+            else:
+                context_lines.append((new_ln, line[1:]))
+                old_ln += 1
+                new_ln += 1
+
+        return [CodeHunk(
+            file_path=file_path,
+            old_start=old_start,
+            old_count=int(header.group(2) or 1),
+            new_start=new_start,
+            new_count=int(header.group(4) or 1),
+            added_lines=added_lines,
+            removed_lines=removed_lines,
+            context_lines=context_lines
+        )]
+
+    @staticmethod
+    def analyze(hunks: List[CodeHunk], include_functions: bool = True) -> Dict[str, Any]:
+        """
+        Compute change statistics, extension counts and function names in
+        a single pass over the hunks.
 
         Args:
             hunks: List of code hunks
+            include_functions: Whether to extract function names
 
         Returns:
-            Dictionary mapping file paths to function names
+            Dictionary with 'change_summary', 'file_extensions' and
+            'functions' (empty if include_functions is False)
         """
-        functions_by_file = {}
-
-        # Patterns for different languages
-        patterns = {
-            'python': r'^\s*def\s+(\w+)\s*\(',
-            'javascript': r'^\s*(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s*)?\()',
-            'java': r'^\s*(?:public|private|protected)?\s*(?:static\s+)?[\w<>]+\s+(\w+)\s*\(',
-            'go': r'^\s*func\s+(?:\(\w+\s+\*?\w+\)\s+)?(\w+)\s*\(',
-        }
+        total_added = 0
+        total_removed = 0
+        files_changed = set()
+        extensions = Counter()
+        functions_by_file: Dict[str, List[str]] = {}
 
         for hunk in hunks:
             file_path = hunk.file_path
-            extension = file_path.split('.')[-1] if '.' in file_path else ''
-
-            # Determine language
-            lang_map = {
-                'py': 'python',
-                'js': 'javascript',
-                'ts': 'javascript',
-                'java': 'java',
-                'go': 'go'
-            }
-            language = lang_map.get(extension)
-
-            if not language or language not in patterns:
-                continue
+            extension = file_extension(file_path)
 
-            pattern = patterns[language]
-            functions = set()
+            total_added += len(hunk.added_lines)
+            total_removed += len(hunk.removed_lines)
+            files_changed.add(file_path)
+            extensions[extension or 'no_extension'] += 1
 
-            # Check added lines for function definitions
-            for _, line_content in hunk.added_lines + hunk.context_lines:
-                match = re.match(pattern, line_content)
-                if match:
-                    # Get first non-None group
-                    func_name = next((g for g in match.groups() if g), None)
-                    if func_name:
-                        functions.add(func_name)
+            language = _LANG_BY_EXTENSION.get(extension)
+            if include_functions and language in _FUNCTION_PATTERNS:
+                functions = _find_functions(hunk, language)
+                if functions:
+                    functions_by_file.setdefault(file_path, []).extend(functions)
 
-            if functions:
-                if file_path not in functions_by_file:
-                    functions_by_file[file_path] = []
-                functions_by_file[file_path].extend(functions)
+        return {
+            'change_summary': {
+                'total_added': total_added,
+                'total_removed': total_removed,
+                'files_changed': len(files_changed),
+                'net_change': total_added - total_removed
+            },
+            'file_extensions': dict(extensions),
+            'functions': functions_by_file
+        }
 
-        return functions_by_file
+    @staticmethod
+    def extract_functions(hunks: List[CodeHunk]) -> Dict[str, List[str]]:
+        """
+        Extract function/method names from changed code.
+
+        Args:
+            hunks: List of code hunks
+
+        Returns:
+            Dictionary mapping file paths to function names
+        """
+        return DiffParser.analyze(hunks)['functions']
 
     @staticmethod
     def get_change_summary(hunks: List[CodeHunk]) -> Dict[str, int]:
@@ -143,17 +328,39 @@ class DiffParser:
         Args:
             hunks: List of code hunks
 
+        Returns:
+            Dictionary with change statistics
+        """
+        return DiffParser.analyze(hunks, include_functions=False)['change_summary']
+
+    @staticmethod
+    def get_file_change_summary(files_changed: List[FileChange]) -> Dict[str, int]:
+        """
+        Get summary statistics of changes without parsing hunks.
+
+        Uses the per-file addition/deletion stats reported by the platform,
+        falling back to counting patch lines when a platform reports none.
+
+        Args:
+            files_changed: List of file changes
+
         Returns:
             Dictionary with change statistics
         """
         total_added = 0
         total_removed = 0
-        files_changed = set()
 
-        for hunk in hunks:
-            total_added += len(hunk.added_lines)
-            total_removed += len(hunk.removed_lines)
-            files_changed.add(hunk.file_path)
+        for file_change in files_changed:
+            if file_change.additions or file_change.deletions or not file_change.patch:
+                total_added += file_change.additions
+                total_removed += file_change.deletions
+                continue
+
+            for line in file_change.patch.splitlines():
+                if line.startswith('+') and not line.startswith('+++'):
+                    total_added += 1
+                elif line.startswith('-') and not line.startswith('---'):
+                    total_removed += 1
 
         return {
             'total_added': total_added,
@@ -173,12 +380,4 @@ class DiffParser:
         Returns:
             Dictionary mapping extensions to counts
         """
-        extensions = {}
-
-        for hunk in hunks:
-            file_path = hunk.file_path
-            ext = file_path.split('.')[-1] if '.' in file_path else 'no_extension'
-            extensions[ext] = extensions.get(ext, 0) + 1
-
-        return extensions
-
+        return DiffParser.analyze(hunks, include_functions=False)['file_extensions']
@@ -1,18 +1,48 @@
 """
 GitHub adapter for fetching PR data.
 """
+import asyncio
+import functools
+import itertools
 import re
-from typing import Dict, Optional
+from typing import Dict, Any, Iterator, Optional
 from datetime import datetime
-from github import Github, GithubException
+from github import Github
+import httpx
 import logging
 
-from src.data_preparation.base_adapter import BasePlatformAdapter, PullRequest, FileChange
+from src.data_preparation.base_adapter import BasePlatformAdapter, PullRequest, FileChange, register
+from src.data_preparation.http_client import get_async_client, run_sync
+from src.utils.timestamps import parse_iso
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# The number must end the URL or be followed by a sub-page, query or fragment
+_GH_PR_RE = re.compile(r"github\.com/([^/]+)/([^/]+)/pull/(\d+)(?:[/?#]|$)")
 
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_API_VERSION = "2022-11-28"
+
+# The files endpoint returns at most 100 files per page and 3000 files in total
+FILES_PER_PAGE = 100
+MAX_FILE_PAGES = 30
+
+
+@functools.lru_cache(maxsize=None)
+def _github_client(token: Optional[str]) -> Github:
+    """
+    Create the PyGithub client for a token on first use.
+
+    Cached so adapters with the same credentials reuse one client and its
+    keep-alive requests.Session instead of redoing TCP/TLS handshakes.
+    """
+    if token:
+        return Github(token, per_page=FILES_PER_PAGE)
+    return Github(per_page=FILES_PER_PAGE)
+
+
+@register('github')
 class GitHubAdapter(BasePlatformAdapter):
     """Adapter for GitHub API."""
 
@@ -21,7 +51,11 @@ class GitHubAdapter(BasePlatformAdapter):
         super().__init__(token or settings.github_token)
         if not self.token:
             logger.warning("No GitHub token provided. API rate limits will be restricted.")
-        self.client = Github(self.token) if self.token else Github()
+
+    @property
+    def client(self) -> Github:
+        """PyGithub client shared by all adapters using the same token."""
+        return _github_client(self.token)
 
     def parse_url(self, url: str) -> Dict[str, str]:
         """
@@ -29,8 +63,7 @@ class GitHubAdapter(BasePlatformAdapter):
 
         Example: https://github.com/owner/repo/pull/123
         """
-        pattern = r"github\.com/([^/]+)/([^/]+)/pull/(\d+)"
-        match = re.search(pattern, url)
+        match = _GH_PR_RE.search(url)
 
         if not match:
             raise ValueError(f"Invalid GitHub PR URL: {url}")
@@ -41,57 +74,103 @@ class GitHubAdapter(BasePlatformAdapter):
             "pr_number": int(match.group(3))
         }
 
-    def fetch_pull_request(self, url: str) -> PullRequest:
+    def _headers(self) -> Dict[str, str]:
+        """Build REST API request headers."""
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": GITHUB_API_VERSION
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    async def _get_json(self, client: httpx.AsyncClient, path: str, **params) -> Any:
+        """GET a REST API path and decode the JSON body."""
+        response = await client.get(f"{GITHUB_API_URL}{path}", headers=self._headers(), params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_pull_request(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> PullRequest:
         """Fetch PR details from GitHub."""
+        return run_sync(self.fetch_pull_request_async(url, parsed))
+
+    async def fetch_pull_request_async(
+        self,
+        url: str,
+        parsed: Optional[Dict[str, Any]] = None
+    ) -> PullRequest:
+        """
+        Fetch PR details from the GitHub REST API.
+
+        The PR, repository and first page of files are requested
+        concurrently; the remaining file pages (known from the PR's
+        changed_files count) are then fetched in parallel.
+        """
         try:
-            parsed = self.parse_url(url)
+            parsed = parsed or self.parse_url(url)
             repo_name = f"{parsed['owner']}/{parsed['repo']}"
             pr_number = parsed['pr_number']
 
             logger.info(f"Fetching GitHub PR: {repo_name}#{pr_number}")
 
-            # Get repository and PR
-            repo = self.client.get_repo(repo_name)
-            pr = repo.get_pull(pr_number)
+            client = get_async_client()
+            pr_path = f"/repos/{repo_name}/pulls/{pr_number}"
+
+            # Get PR, repository and the first page of file changes
+            pr, repo, first_page = await asyncio.gather(
+                self._get_json(client, pr_path),
+                self._get_json(client, f"/repos/{repo_name}"),
+                self._get_json(client, f"{pr_path}/files", per_page=FILES_PER_PAGE, page=1)
+            )
+
+            # Get remaining file pages in parallel
+            last_page = min(-(-pr['changed_files'] // FILES_PER_PAGE), MAX_FILE_PAGES)
+            other_pages = await asyncio.gather(*[
+                self._get_json(client, f"{pr_path}/files", per_page=FILES_PER_PAGE, page=page)
+                for page in range(2, last_page + 1)
+            ])
 
-            # Get file changes
-            files_changed = []
-            for file in pr.get_files():
-                files_changed.append(FileChange(
-                    filename=file.filename,
-                    status=file.status,
-                    additions=file.additions,
-                    deletions=file.deletions,
-                    changes=file.changes,
-                    patch=file.patch,
-                    previous_filename=file.previous_filename
-                ))
+            # Built in one comprehension over the already-fetched pages rather
+            # than pre-sized from changed_files, which overcounts past the
+            # API's 3000-file cap
+            files_changed = [
+                FileChange(
+                    filename=file['filename'],
+                    status=file['status'],
+                    additions=file['additions'],
+                    deletions=file['deletions'],
+                    changes=file['changes'],
+                    patch=file.get('patch'),
+                    previous_filename=file.get('previous_filename')
+                )
+                for file in itertools.chain(first_page, *other_pages)
+            ]
 
             # Determine primary language
-            language = repo.language
+            language = repo.get('language')
 
             # Get labels
-            labels = [label.name for label in pr.labels]
+            labels = [label['name'] for label in pr.get('labels', [])]
 
             pull_request = PullRequest(
                 platform="github",
-                id=str(pr.id),
-                number=pr.number,
-                title=pr.title,
-                description=pr.body or "",
-                author=pr.user.login,
-                created_at=pr.created_at,
-                updated_at=pr.updated_at,
-                state=pr.state,
-                source_branch=pr.head.ref,
-                target_branch=pr.base.ref,
+                id=str(pr['id']),
+                number=pr['number'],
+                title=pr['title'],
+                description=pr.get('body') or "",
+                author=pr['user']['login'],
+                created_at=parse_iso(pr['created_at']),
+                updated_at=parse_iso(pr['updated_at']),
+                state=pr['state'],
+                source_branch=pr['head']['ref'],
+                target_branch=pr['base']['ref'],
                 repository=repo_name,
                 url=url,
                 files_changed=files_changed,
-                commits_count=pr.commits,
-                additions=pr.additions,
-                deletions=pr.deletions,
-                changed_files=pr.changed_files,
+                commits_count=pr['commits'],
+                additions=pr['additions'],
+                deletions=pr['deletions'],
+                changed_files=pr['changed_files'],
                 labels=labels,
                 language=language
             )
@@ -99,13 +178,53 @@ class GitHubAdapter(BasePlatformAdapter):
             logger.info(f"Successfully fetched PR with {len(files_changed)} files changed")
             return pull_request
 
-        except GithubException as e:
+        except httpx.HTTPStatusError as e:
             logger.error(f"GitHub API error: {e}")
             raise
         except Exception as e:
             logger.error(f"Error fetching GitHub PR: {e}")
             raise
 
+    def iter_files(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> Iterator[FileChange]:
+        """
+        Lazily iterate over the file changes of a PR.
+
+        Pages of FILES_PER_PAGE files are fetched as the iterator advances,
+        so callers that stream over the files (or stop early) never hold
+        every patch of a large PR in memory at once.
+
+        Args:
+            url: The URL of the PR
+            parsed: Pre-parsed URL components (parsed from url if not provided)
+
+        Yields:
+            FileChange objects in API order
+        """
+        parsed = parsed or self.parse_url(url)
+        repo_name = f"{parsed['owner']}/{parsed['repo']}"
+
+        # Lazy repo avoids fetching the repository metadata
+        pr = self.client.get_repo(repo_name, lazy=True).get_pull(parsed['pr_number'])
+        for file in pr.get_files():
+            yield FileChange(
+                filename=file.filename,
+                status=file.status,
+                additions=file.additions,
+                deletions=file.deletions,
+                changes=file.changes,
+                patch=file.patch,
+                previous_filename=file.previous_filename
+            )
+
+    def get_updated_at(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Get PR last-updated timestamp from GitHub."""
+        parsed = parsed or self.parse_url(url)
+        repo_name = f"{parsed['owner']}/{parsed['repo']}"
+
+        # Lazy repo avoids fetching the repository metadata
+        pr = self.client.get_repo(repo_name, lazy=True).get_pull(parsed['pr_number'])
+        return pr.updated_at.isoformat()
+
     def get_file_content(self, repo: str, filepath: str, ref: str) -> str:
         """Get file content from GitHub."""
         try:
@@ -1,18 +1,33 @@
 """
 GitLab adapter for fetching MR data.
 """
+import asyncio
+import functools
 import re
-from typing import Dict, Optional
-from datetime import datetime
+from typing import Dict, Any, Optional
+from urllib.parse import quote
 import gitlab
+import httpx
 import logging
 
-from src.data_preparation.base_adapter import BasePlatformAdapter, PullRequest, FileChange
+from src.data_preparation.base_adapter import BasePlatformAdapter, PullRequest, FileChange, register
+from src.data_preparation.http_client import get_async_client, run_sync
+from src.utils.timestamps import parse_iso
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# The number must end the URL or be followed by a sub-page, query or fragment
+_GL_MR_RE = re.compile(r"gitlab\.com/([^/]+/[^/]+)/-/merge_requests/(\d+)(?:[/?#]|$)")
 
+
+@functools.lru_cache(maxsize=None)
+def _gitlab_client(url: str, token: Optional[str]) -> gitlab.Gitlab:
+    """Create the python-gitlab client for a server and token, once per process."""
+    return gitlab.Gitlab(url, private_token=token)
+
+
+@register('gitlab')
 class GitLabAdapter(BasePlatformAdapter):
     """Adapter for GitLab API."""
 
@@ -26,7 +41,11 @@ class GitLabAdapter(BasePlatformAdapter):
             logger.warning("No GitLab token provided. Private projects won't be accessible.")
 
         self.gitlab_url = self.extra_config.get('url', settings.gitlab_url)
-        self.client = gitlab.Gitlab(self.gitlab_url, private_token=self.token)
+
+    @property
+    def client(self) -> gitlab.Gitlab:
+        """python-gitlab client shared by all adapters using the same server and token."""
+        return _gitlab_client(self.gitlab_url, self.token)
 
     def parse_url(self, url: str) -> Dict[str, str]:
         """
@@ -34,8 +53,7 @@ class GitLabAdapter(BasePlatformAdapter):
 
         Example: https://gitlab.com/owner/repo/-/merge_requests/123
         """
-        pattern = r"gitlab\.com/([^/]+/[^/]+)/-/merge_requests/(\d+)"
-        match = re.search(pattern, url)
+        match = _GL_MR_RE.search(url)
 
         if not match:
             raise ValueError(f"Invalid GitLab MR URL: {url}")
@@ -45,23 +63,58 @@ class GitLabAdapter(BasePlatformAdapter):
             "mr_number": int(match.group(2))
         }
 
-    def fetch_pull_request(self, url: str) -> PullRequest:
+    def _headers(self) -> Dict[str, str]:
+        """Build REST API request headers."""
+        return {"PRIVATE-TOKEN": self.token} if self.token else {}
+
+    async def _get(self, client: httpx.AsyncClient, path: str, **params) -> httpx.Response:
+        """GET a REST API path."""
+        response = await client.get(
+            f"{self.gitlab_url.rstrip('/')}/api/v4{path}",
+            headers=self._headers(),
+            params=params
+        )
+        response.raise_for_status()
+        return response
+
+    def fetch_pull_request(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> PullRequest:
         """Fetch MR details from GitLab."""
+        return run_sync(self.fetch_pull_request_async(url, parsed))
+
+    async def fetch_pull_request_async(
+        self,
+        url: str,
+        parsed: Optional[Dict[str, Any]] = None
+    ) -> PullRequest:
+        """
+        Fetch MR details from the GitLab REST API.
+
+        The MR, its changes and its commits are requested concurrently.
+        """
         try:
-            parsed = self.parse_url(url)
+            parsed = parsed or self.parse_url(url)
             project_path = parsed['project']
             mr_number = parsed['mr_number']
 
             logger.info(f"Fetching GitLab MR: {project_path}!{mr_number}")
 
-            # Get project and MR
-            project = self.client.projects.get(project_path)
-            mr = project.mergerequests.get(mr_number)
+            client = get_async_client()
+            mr_path = f"/projects/{quote(project_path, safe='')}/merge_requests/{mr_number}"
 
-            # Get file changes
-            files_changed = []
-            changes = mr.changes()
+            # Get MR, file changes and commits
+            mr_response, changes_response, commits_response = await asyncio.gather(
+                self._get(client, mr_path),
+                self._get(client, f"{mr_path}/changes"),
+                # One-item page: only the X-Total header is needed
+                self._get(client, f"{mr_path}/commits", per_page=1)
+            )
+            mr = mr_response.json()
+            changes = changes_response.json()
 
+            # GitLab omits X-Total for very large result sets
+            commits_count = int(commits_response.headers.get('X-Total', 0))
+
+            files_changed = []
             for change in changes.get('changes', []):
                 # Determine status
                 if change.get('new_file'):
@@ -84,24 +137,24 @@ class GitLabAdapter(BasePlatformAdapter):
                 ))
 
             # Get labels
-            labels = mr.labels
+            labels = mr.get('labels', [])
 
             pull_request = PullRequest(
                 platform="gitlab",
-                id=str(mr.id),
-                number=mr.iid,
-                title=mr.title,
-                description=mr.description or "",
-                author=mr.author.get('username', 'unknown'),
-                created_at=datetime.fromisoformat(mr.created_at.replace('Z', '+00:00')),
-                updated_at=datetime.fromisoformat(mr.updated_at.replace('Z', '+00:00')),
-                state=mr.state,
-                source_branch=mr.source_branch,
-                target_branch=mr.target_branch,
+                id=str(mr['id']),
+                number=mr['iid'],
+                title=mr['title'],
+                description=mr.get('description') or "",
+                author=mr.get('author', {}).get('username', 'unknown'),
+                created_at=parse_iso(mr['created_at']),
+                updated_at=parse_iso(mr['updated_at']),
+                state=mr['state'],
+                source_branch=mr['source_branch'],
+                target_branch=mr['target_branch'],
                 repository=project_path,
                 url=url,
                 files_changed=files_changed,
-                commits_count=len(mr.commits()),
+                commits_count=commits_count,
                 additions=0,  # Not easily available
                 deletions=0,
                 changed_files=len(files_changed),
@@ -112,21 +165,31 @@ class GitLabAdapter(BasePlatformAdapter):
             logger.info(f"Successfully fetched MR with {len(files_changed)} files changed")
             return pull_request
 
-        except gitlab.exceptions.GitlabError as e:
+        except httpx.HTTPStatusError as e:
             logger.error(f"GitLab API error: {e}")
             raise
         except Exception as e:
             logger.error(f"Error fetching GitLab MR: {e}")
             raise
 
+    def get_updated_at(self, url: str, parsed: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Get MR last-updated timestamp from GitLab."""
+        parsed = parsed or self.parse_url(url)
+
+        # Lazy project avoids fetching the project metadata
+        project = self.client.projects.get(parsed['project'], lazy=True)
+        mr = project.mergerequests.get(parsed['mr_number'])
+        return mr.updated_at
+
     def get_file_content(self, repo: str, filepath: str, ref: str) -> str:
         """Get file content from GitLab."""
         try:
-            project = self.client.projects.get(repo)
-            file_info = project.files.get(file_path=filepath, ref=ref)
+            # Raw bytes in chunks skip the base64 copy embedded in file metadata;
+            # the lazy project avoids fetching the project itself
+            project = self.client.projects.get(repo, lazy=True)
+            chunks = project.files.raw(file_path=filepath, ref=ref, iterator=True)
 
-            import base64
-            content = base64.b64decode(file_info.content).decode('utf-8')
+            content = b''.join(chunks).decode('utf-8')
             return content
 
         except Exception as e:
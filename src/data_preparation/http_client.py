@@ -0,0 +1,108 @@
+"""
+Shared pooled HTTP client for platform adapters.
+"""
+import asyncio
+import importlib.util
+import logging
+import weakref
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# One client per event loop: httpx connection pools cannot be shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client for the running event loop.
+
+    All adapters running on the same loop share one connection pool, so
+    concurrent requests to the same host reuse TCP/TLS connections and are
+    multiplexed over HTTP/2 when available.
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_connections
+            ),
+            timeout=httpx.Timeout(settings.http_timeout),
+            follow_redirects=True
+        )
+        _clients[loop] = client
+        logger.debug(f"Created pooled HTTP client (http2={_HTTP2_AVAILABLE})")
+
+    return client
+
+
+def create_sync_client(
+    max_connections: int,
+    on_request: Optional[Callable[[httpx.Request], None]] = None
+) -> httpx.Client:
+    """
+    Create a keep-alive HTTP client for blocking SDKs (e.g. the OpenAI client).
+
+    Args:
+        max_connections: Maximum number of pooled connections
+        on_request: Optional hook called before every request is sent
+
+    Returns:
+        Pooled httpx.Client
+    """
+    return httpx.Client(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        ),
+        timeout=httpx.Timeout(settings.http_timeout),
+        event_hooks={"request": [on_request]} if on_request else None
+    )
+
+
+async def close_async_client():
+    """Close the shared client for the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """
+    Run an async adapter call from blocking code.
+
+    The call runs on a fresh event loop whose pooled client is closed
+    before returning, so no connections are leaked with the loop.
+
+    Args:
+        awaitable: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    async def _runner() -> T:
+        try:
+            return await awaitable
+        finally:
+            await close_async_client()
+
+    return asyncio.run(_runner())
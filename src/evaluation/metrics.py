@@ -6,10 +6,26 @@ from typing import List, Dict, Any
 from datetime import datetime
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Numeric ReviewMetrics fields kept as parallel arrays for aggregation
+_AGGREGATED_FIELDS = (
+    'total_time_seconds',
+    'issues_found',
+    'critical_issues',
+    'false_positives_caught',
+    'token_count',
+    'estimated_cost_usd',
+    'initial_issues',
+    'filtered_issues'
+)
+
+_INITIAL_CAPACITY = 1024
+
 
-@dataclass
+@dataclass(slots=True)
 class ReviewMetrics:
     """Metrics for a single review."""
     review_id: str
@@ -48,11 +64,34 @@ class MetricsTracker:
         """Initialize metrics tracker."""
         self.metrics: List[ReviewMetrics] = []
 
+        # Structure-of-arrays copy of the numeric fields; only the first
+        # self._count entries are valid, capacity doubles when full
+        self._columns: Dict[str, np.ndarray] = {
+            field: np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+            for field in _AGGREGATED_FIELDS
+        }
+        self._count = 0
+
     def record_review(self, metrics: ReviewMetrics):
         """Record metrics for a review."""
         self.metrics.append(metrics)
+
+        if self._count == len(self._columns['issues_found']):
+            for field, column in self._columns.items():
+                grown = np.empty(2 * len(column), dtype=np.float64)
+                grown[:self._count] = column[:self._count]
+                self._columns[field] = grown
+
+        for field, column in self._columns.items():
+            column[self._count] = getattr(metrics, field)
+        self._count += 1
+
         logger.info(f"Recorded metrics for review: {metrics.review_id}")
 
+    def _column(self, field: str) -> np.ndarray:
+        """Get the recorded values of a numeric field."""
+        return self._columns[field][:self._count]
+
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get summary statistics across all reviews."""
         if not self.metrics:
@@ -62,13 +101,13 @@ class MetricsTracker:
 
         return {
             'total_reviews': total_reviews,
-            'avg_review_time': sum(m.total_time_seconds for m in self.metrics) / total_reviews,
-            'avg_issues_found': sum(m.issues_found for m in self.metrics) / total_reviews,
-            'avg_critical_issues': sum(m.critical_issues for m in self.metrics) / total_reviews,
-            'total_issues': sum(m.issues_found for m in self.metrics),
-            'avg_false_positives_caught': sum(m.false_positives_caught for m in self.metrics) / total_reviews,
-            'avg_token_count': sum(m.token_count for m in self.metrics) / total_reviews,
-            'total_cost': sum(m.estimated_cost_usd for m in self.metrics),
+            'avg_review_time': float(self._column('total_time_seconds').mean()),
+            'avg_issues_found': float(self._column('issues_found').mean()),
+            'avg_critical_issues': float(self._column('critical_issues').mean()),
+            'total_issues': int(self._column('issues_found').sum()),
+            'avg_false_positives_caught': float(self._column('false_positives_caught').mean()),
+            'avg_token_count': float(self._column('token_count').mean()),
+            'total_cost': float(self._column('estimated_cost_usd').sum()),
             'platform_distribution': self._get_platform_distribution()
         }
 
@@ -95,15 +134,15 @@ class MetricsTracker:
         if not self.metrics:
             return 0.0
 
-        total_issues = sum(m.issues_found for m in self.metrics)
+        total_issues = self._column('issues_found').sum()
         if total_issues == 0:
             return 0.0
 
-        avg_time_per_issue = sum(m.total_time_seconds for m in self.metrics) / total_issues
-        avg_cost_per_issue = sum(m.estimated_cost_usd for m in self.metrics) / total_issues
+        avg_time_per_issue = self._column('total_time_seconds').sum() / total_issues
+        avg_cost_per_issue = self._column('estimated_cost_usd').sum() / total_issues
 
-        total_initial = sum(m.initial_issues for m in self.metrics)
-        total_filtered = sum(m.filtered_issues for m in self.metrics)
+        total_initial = self._column('initial_issues').sum()
+        total_filtered = self._column('filtered_issues').sum()
 
         false_positive_rate = total_filtered / total_initial if total_initial > 0 else 0
 
@@ -115,5 +154,5 @@ class MetricsTracker:
             (false_positive_rate) * 0.4
         )
 
-        return min(efficiency * 100, 100)  # Scale to 0-100
+        return float(min(efficiency * 100, 100))  # Scale to 0-100
 
@@ -4,19 +4,27 @@ Streamlit frontend for PR Reviewer.
 import streamlit as st
 import sys
 from pathlib import Path
+from typing import Optional, Tuple, TYPE_CHECKING
 
 # Add src to path
 src_path = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(src_path))
 
-from src.agents.crew_orchestrator import ReviewCrew
 from src.evaluation.metrics import MetricsTracker, ReviewMetrics
-from src.rag.indexer import KnowledgeBaseIndexer
 from src.config.settings import settings
+from collections import Counter, OrderedDict
 from datetime import datetime
+import hashlib
+import threading
 import time
 import json
 
+# CrewAI, Chroma and the platform SDKs are imported on first use so that
+# first paint and reruns that never review a PR stay fast
+if TYPE_CHECKING:
+    from src.agents.crew_orchestrator import ReviewCrew
+    from src.rag.indexer import KnowledgeBaseIndexer
+
 
 # Page config
 st.set_page_config(
@@ -26,7 +34,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
+# Custom CSS, injected once per run for the whole page
 st.markdown("""
 <style>
     .main-header {
@@ -60,6 +68,19 @@ st.markdown("""
         padding: 1rem;
         margin: 0.5rem 0;
     }
+    .review-container {
+        background-color: #f0f2f6;
+        padding: 1.5rem;
+        border-radius: 0.5rem;
+        border-left: 4px solid #1f77b4;
+        color: #262730;
+        margin: 1rem 0;
+    }
+    .review-text {
+        color: #262730 !important;
+        font-size: 1rem;
+        line-height: 1.6;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -71,6 +92,69 @@ if 'review_history' not in st.session_state:
     st.session_state.review_history = []
 
 
+@st.cache_resource
+def get_crew() -> "ReviewCrew":
+    """Get the review crew, built once per process and shared across reruns and sessions."""
+    from src.agents.crew_orchestrator import ReviewCrew
+    return ReviewCrew()
+
+
+@st.cache_resource
+def get_indexer() -> "KnowledgeBaseIndexer":
+    """Get the knowledge base indexer, built once per process."""
+    from src.rag.indexer import KnowledgeBaseIndexer
+    return KnowledgeBaseIndexer()
+
+
+# Seconds a finished review is reused for the same PR URL
+REVIEW_CACHE_TTL = 3600
+# Finished reviews kept in memory before the oldest is evicted
+REVIEW_CACHE_MAX_ENTRIES = 128
+
+
+class _ReviewCache:
+    """
+    Finished reviews by PR URL, expiring after REVIEW_CACHE_TTL seconds.
+
+    Keyed by the URL alone: it is the only input the crew uses, so the
+    sidebar's review mode and reflection options do not split the cache.
+    Results are copied in and out because callers add per-run fields.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        # Sessions run in separate threads
+        self._lock = threading.Lock()
+
+    def get(self, pr_url: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(pr_url)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= REVIEW_CACHE_TTL:
+                del self._entries[pr_url]
+                return None
+            self._entries.move_to_end(pr_url)
+            return dict(entry[1])
+
+    def put(self, pr_url: str, result: dict):
+        with self._lock:
+            self._entries[pr_url] = (time.monotonic(), dict(result))
+            self._entries.move_to_end(pr_url)
+            while len(self._entries) > REVIEW_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def discard(self, pr_url: str):
+        with self._lock:
+            self._entries.pop(pr_url, None)
+
+
+@st.cache_resource
+def get_review_cache() -> _ReviewCache:
+    """Get the review cache, shared across reruns and sessions."""
+    return _ReviewCache()
+
+
 def main():
     """Main application."""
 
@@ -103,6 +187,18 @@ def main():
             help="Use critic agent to validate suggestions"
         )
 
+        force_refresh = st.checkbox(
+            "Force refresh",
+            value=False,
+            help="Re-fetch the PR and re-run the review, ignoring cached results"
+        )
+
+        review_options = {
+            'review_mode': review_mode,
+            'enable_reflection': enable_reflection,
+            'force_refresh': force_refresh
+        }
+
         st.markdown("---")
 
         # System status
@@ -129,7 +225,7 @@ def main():
         if st.button("🔄 Initialize Knowledge Base"):
             with st.spinner("Indexing knowledge base..."):
                 try:
-                    indexer = KnowledgeBaseIndexer()
+                    indexer = get_indexer()
                     indexer.index_all()
                     st.success("Knowledge base initialized!")
                 except Exception as e:
@@ -139,19 +235,19 @@ def main():
     tab1, tab2, tab3, tab4 = st.tabs(["📝 Review PR", "📊 Metrics", "🎮 Demo", "ℹ️ About"])
 
     with tab1:
-        review_tab()
+        review_tab(review_options)
 
     with tab2:
         metrics_tab()
 
     with tab3:
-        demo_tab()
+        demo_tab(review_options)
 
     with tab4:
         about_tab()
 
 
-def review_tab():
+def review_tab(review_options: dict):
     """PR review tab."""
     st.header("Review Pull Request")
 
@@ -169,57 +265,58 @@ def review_tab():
         review_button = st.button("🚀 Review PR", type="primary", use_container_width=True)
 
     if review_button and pr_url:
-        perform_review(pr_url)
+        perform_review(pr_url, **review_options)
 
-    # Show review history
+    render_review_history()
+
+
+@st.fragment
+def render_review_history():
+    """Recent reviews; a fragment so interacting with it reruns only this part."""
     if st.session_state.review_history:
         st.markdown("---")
         st.subheader("📜 Recent Reviews")
 
         for i, review in enumerate(reversed(st.session_state.review_history[-5:])):
             with st.expander(f"Review #{len(st.session_state.review_history) - i}: {review.get('pr_info', {}).get('title', 'Unknown')}"):
-                display_review_result(review)
+                display_review_result(review, key_prefix="history")
 
 
-def perform_review(pr_url: str):
+def perform_review(
+    pr_url: str,
+    review_mode: str = "Standard",
+    enable_reflection: bool = True,
+    force_refresh: bool = False
+):
     """Perform PR review."""
     try:
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
         start_time = time.time()
 
-        status_text.text("🔍 Initializing review crew...")
-        progress_bar.progress(10)
+        review_cache = get_review_cache()
 
-        # Initialize crew
-        crew = ReviewCrew()
+        # Drop any cached result so the review runs again
+        if force_refresh:
+            review_cache.discard(pr_url)
 
-        status_text.text("📥 Fetching PR data...")
-        progress_bar.progress(30)
+        result = review_cache.get(pr_url)
+        if result is None:
+            result = stream_review(pr_url, force_refresh)
 
-        # Perform review
-        status_text.text("🤖 Agents analyzing code...")
-        progress_bar.progress(50)
-
-        result = crew.review_pull_request(pr_url)
-
-        status_text.text("✅ Review complete!")
-        progress_bar.progress(100)
+            # Never keep a failure cached for the whole TTL
+            if result.get('success'):
+                review_cache.put(pr_url, result)
 
         end_time = time.time()
 
         # Store in history
         result['review_time'] = end_time - start_time
         result['timestamp'] = datetime.now()
+        # Stable across reruns so the download button is not remounted each time
+        result['download_key'] = hashlib.md5(
+            (pr_url + result['timestamp'].isoformat()).encode()
+        ).hexdigest()
         st.session_state.review_history.append(result)
 
-        # Display result
-        time.sleep(0.5)
-        progress_bar.empty()
-        status_text.empty()
-
         if result.get('success'):
             st.success(f"Review completed in {result['review_time']:.2f} seconds!")
             display_review_result(result)
@@ -230,8 +327,54 @@ def perform_review(pr_url: str):
         st.error(f"Error during review: {str(e)}")
 
 
-def display_review_result(result: dict):
-    """Display review results."""
+def stream_review(pr_url: str, force_refresh: bool = False) -> dict:
+    """
+    Run a review, showing the report as the synthesizer writes it.
+
+    The streamed text is replaced by the full result display once the
+    review completes.
+
+    Returns:
+        Review result in the shape returned by ReviewCrew.review_pull_request
+    """
+    info = {}
+    placeholder = st.empty()
+
+    with placeholder.container():
+        status = st.status("🤖 Agents analyzing code...")
+
+        def chunks():
+            stream = get_crew().review_pull_request_stream(pr_url, refresh=force_refresh, info=info)
+            for i, chunk in enumerate(stream):
+                if i == 0:
+                    status.update(label="✍️ Writing review...")
+                yield chunk
+
+        try:
+            review = st.write_stream(chunks())
+        except Exception as e:
+            status.update(label="❌ Review failed", state="error")
+            return {'success': False, 'error': str(e), 'url': pr_url}
+
+    placeholder.empty()
+
+    return {
+        'success': True,
+        'pr_info': info.get('pr_info', {}),
+        'review': review,
+        'platform': info.get('platform', 'Unknown'),
+        'url': pr_url,
+        'cached': info.get('cached', False)
+    }
+
+
+def display_review_result(result: dict, key_prefix: str = "result"):
+    """
+    Display review results.
+
+    key_prefix keeps widget keys unique when the same result is shown in
+    more than one place on the page.
+    """
     if not result.get('success'):
         st.error(f"Review failed: {result.get('error')}")
         return
@@ -256,26 +399,8 @@ def display_review_result(result: dict):
     # Display using Streamlit's native markdown for better readability
     st.markdown("---")
 
-    # Use a container with custom styling
+    # Use a container with custom styling (see the page CSS)
     with st.container():
-        st.markdown("""
-        <style>
-        .review-container {
-            background-color: #f0f2f6;
-            padding: 1.5rem;
-            border-radius: 0.5rem;
-            border-left: 4px solid #1f77b4;
-            color: #262730;
-            margin: 1rem 0;
-        }
-        .review-text {
-            color: #262730 !important;
-            font-size: 1rem;
-            line-height: 1.6;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
         # Display review text with proper formatting
         st.markdown(f'<div class="review-container review-text">', unsafe_allow_html=True)
         st.markdown(review_text)
@@ -283,8 +408,8 @@ def display_review_result(result: dict):
 
     st.markdown("---")
 
-    # Download review with unique key based on timestamp
-    download_key = f"download_{hash(pr_info.get('title', 'pr') + str(time.time()))}"
+    # Download review, keyed by the result so the key is stable across reruns
+    download_key = f"{key_prefix}_download_{result['download_key']}"
     st.download_button(
         label="📥 Download Review",
         data=review_text,
@@ -294,6 +419,36 @@ def display_review_result(result: dict):
     )
 
 
+def history_stats() -> dict:
+    """
+    Aggregate the review history in a single pass.
+
+    The history is append-only, so the result is memoized in session
+    state by its length and only recomputed after a new review.
+    """
+    history = st.session_state.review_history
+    cached = st.session_state.get('history_stats')
+    if cached and cached['count'] == len(history):
+        return cached
+
+    total_time = 0.0
+    successful = 0
+    platforms = Counter()
+    for review in history:
+        total_time += review.get('review_time', 0)
+        successful += bool(review.get('success'))
+        platforms[review.get('platform', 'Unknown')] += 1
+
+    stats = {
+        'count': len(history),
+        'avg_time': total_time / len(history) if history else 0.0,
+        'successful': successful,
+        'platforms': dict(platforms)
+    }
+    st.session_state.history_stats = stats
+    return stats
+
+
 def metrics_tab():
     """Metrics and analytics tab."""
     st.header("📊 Review Metrics")
@@ -303,43 +458,44 @@ def metrics_tab():
         return
 
     # Summary stats
-    total_reviews = len(st.session_state.review_history)
-    avg_time = sum(r.get('review_time', 0) for r in st.session_state.review_history) / total_reviews
+    stats = history_stats()
+    total_reviews = stats['count']
 
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Total Reviews", total_reviews)
     with col2:
-        st.metric("Avg Review Time", f"{avg_time:.2f}s")
+        st.metric("Avg Review Time", f"{stats['avg_time']:.2f}s")
     with col3:
-        successful = sum(1 for r in st.session_state.review_history if r.get('success'))
-        st.metric("Success Rate", f"{(successful/total_reviews)*100:.1f}%")
+        st.metric("Success Rate", f"{(stats['successful']/total_reviews)*100:.1f}%")
 
+    render_metrics_details()
+
+
+@st.fragment
+def render_metrics_details():
+    """Platform chart and recent reviews table, rerun independently of the page."""
     # Platform distribution
     st.subheader("Platform Distribution")
-    platforms = {}
-    for review in st.session_state.review_history:
-        platform = review.get('platform', 'Unknown')
-        platforms[platform] = platforms.get(platform, 0) + 1
-
-    st.bar_chart(platforms)
+    st.bar_chart(history_stats()['platforms'])
 
     # Recent reviews table
     st.subheader("Recent Reviews")
 
-    table_data = []
-    for review in reversed(st.session_state.review_history[-10:]):
-        table_data.append({
+    table_data = [
+        {
             "PR Title": review.get('pr_info', {}).get('title', 'Unknown')[:50],
             "Platform": review.get('platform', 'Unknown').title(),
             "Time (s)": f"{review.get('review_time', 0):.2f}",
             "Status": "✅" if review.get('success') else "❌"
-        })
+        }
+        for review in reversed(st.session_state.review_history[-10:])
+    ]
 
     st.table(table_data)
 
 
-def demo_tab():
+def demo_tab(review_options: dict):
     """Demo tab with example PRs."""
     st.header("🎮 Demo Mode")
 
@@ -371,7 +527,7 @@ def demo_tab():
             st.markdown(f"**Description:** {example['description']}")
 
             if st.button(f"Review this PR", key=example['url']):
-                perform_review(example['url'])
+                perform_review(example['url'], **review_options)
 
 
 def about_tab():
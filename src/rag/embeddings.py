@@ -1,29 +1,85 @@
 """
 Embedding model wrapper for consistent embedding generation.
 """
-from typing import List, Union
-from openai import OpenAI
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Union
+from openai import AsyncOpenAI, OpenAI
+import asyncio
 import logging
+import tiktoken
 
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of query embeddings memoized per EmbeddingModel
+QUERY_CACHE_SIZE = 1024
+
+# Input limit of the OpenAI embedding models, in tokens
+MAX_INPUT_TOKENS = 8191
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name: str) -> "tiktoken.Encoding":
+    """
+    Get the tokenizer of an embedding model.
+
+    Args:
+        model_name: Name of the embedding model
+
+    Returns:
+        The model's tiktoken encoding (cl100k_base for unknown models)
+    """
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
 
 class EmbeddingModel:
     """Wrapper for embedding models."""
 
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, batch_size: int = None, dimensions: int = None):
         """
         Initialize the embedding model.
 
         Args:
             model_name: Name of the embedding model
+            batch_size: Maximum number of texts sent per embeddings request
+            dimensions: Output vector size; text-embedding-3 models return
+                shortened vectors that keep most of the retrieval quality
+                (full size if None)
         """
         self.model_name = model_name or settings.embedding_model
+        self.batch_size = batch_size or settings.embedding_batch_size
+        self.dimensions = dimensions or settings.embedding_dimensions
+        # Only sent when set: older models reject the dimensions parameter
+        self._request_params = {'model': self.model_name}
+        if self.dimensions:
+            self._request_params['dimensions'] = self.dimensions
         self.client = OpenAI(api_key=settings.openai_api_key)
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
         logger.info(f"Initialized embedding model: {self.model_name}")
 
+    @property
+    def _encoding(self) -> "tiktoken.Encoding":
+        """Tokenizer of the embedding model."""
+        return get_encoding(self.model_name)
+
+    def _truncate(self, text: str) -> str:
+        """Trim a text to the model's input token limit."""
+        # A token is at least one byte, so short texts cannot exceed the limit
+        if len(text.encode('utf-8')) <= MAX_INPUT_TOKENS:
+            return text
+
+        tokens = self._encoding.encode(text)
+        if len(tokens) <= MAX_INPUT_TOKENS:
+            return text
+
+        logger.warning(f"Truncating text of {len(tokens)} tokens to {MAX_INPUT_TOKENS} for embedding")
+        return self._encoding.decode(tokens[:MAX_INPUT_TOKENS])
+
     def embed_text(self, text: Union[str, List[str]]) -> List[List[float]]:
         """
         Generate embeddings for text(s).
@@ -44,13 +100,72 @@ class EmbeddingModel:
             if not texts:
                 return []
 
-            # Generate embeddings
-            response = self.client.embeddings.create(
-                input=texts,
-                model=self.model_name
-            )
+            # Generate embeddings, one request per batch
+            embeddings = []
+            for start in range(0, len(texts), self.batch_size):
+                batch = [self._truncate(t) for t in texts[start:start + self.batch_size]]
+                response = self.client.embeddings.create(
+                    input=batch,
+                    **self._request_params
+                )
+                embeddings.extend(item.embedding for item in response.data)
 
-            embeddings = [item.embedding for item in response.data]
+            logger.debug(f"Generated {len(embeddings)} embeddings")
+
+            return embeddings
+
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+
+    async def aembed_text(
+        self,
+        text: Union[str, List[str]],
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for text(s), sending the batches concurrently.
+
+        The async client retries rate-limited (429) requests with
+        exponential backoff.
+
+        Args:
+            text: Single text or list of texts
+            semaphore: Bounds concurrent requests; share one across calls
+                to cap their combined concurrency (a per-call one is
+                created if None)
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        try:
+            texts = [text] if isinstance(text, str) else text
+            texts = [t for t in texts if t.strip()]
+
+            if not texts:
+                return []
+
+            semaphore = semaphore or asyncio.Semaphore(settings.embedding_max_concurrency)
+
+            # The async client's connection pool is bound to the running event loop
+            async with AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                max_retries=settings.openai_max_retries
+            ) as client:
+                async def embed_batch(batch: List[str]) -> List[List[float]]:
+                    async with semaphore:
+                        response = await client.embeddings.create(
+                            input=[self._truncate(t) for t in batch],
+                            **self._request_params
+                        )
+                    return [item.embedding for item in response.data]
+
+                results = await asyncio.gather(*[
+                    embed_batch(texts[start:start + self.batch_size])
+                    for start in range(0, len(texts), self.batch_size)
+                ])
+
+            embeddings = [embedding for batch in results for embedding in batch]
             logger.debug(f"Generated {len(embeddings)} embeddings")
 
             return embeddings
@@ -81,6 +196,45 @@ class EmbeddingModel:
         Returns:
             Embedding vector
         """
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            self._query_cache.move_to_end(query)
+            return cached
+
         embeddings = self.embed_text(query)
-        return embeddings[0] if embeddings else []
+        embedding = embeddings[0] if embeddings else []
+
+        if embedding:
+            self._query_cache[query] = embedding
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+        return embedding
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several queries in one request.
 
+        Cached queries are not re-sent; blank queries get an empty vector.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Embedding vectors in query order
+        """
+        found = {}
+        for query in queries:
+            if query in self._query_cache:
+                self._query_cache.move_to_end(query)
+                found[query] = self._query_cache[query]
+
+        missing = list(dict.fromkeys(q for q in queries if q.strip() and q not in found))
+        if missing:
+            embedded = dict(zip(missing, self.embed_text(missing)))
+            found.update(embedded)
+            self._query_cache.update(embedded)
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+        return [found.get(query, []) for query in queries]
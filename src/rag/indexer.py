@@ -2,60 +2,351 @@
 Indexer for populating the knowledge base.
 """
 import os
+import json
+import pickle
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
+import asyncio
 import logging
 import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 
 from src.rag.vector_store import VectorStore
-from src.rag.embeddings import EmbeddingModel
+from src.rag.embeddings import EmbeddingModel, get_encoding
+from src.utils.file_cache import atomic_write
+from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Knowledge base sections: (directory, collection name, metadata)
+KNOWLEDGE_BASE_SECTIONS = [
+    ("best_practices", "best_practices", {"type": "best_practice"}),
+    ("code_patterns", "code_patterns", {"type": "code_pattern"}),
+    ("review_examples", "review_examples", {"type": "review_example"})
+]
+
+# Records the mtime of every indexed file, next to the Chroma database
+MANIFEST_FILENAME = "index_manifest.json"
+
+# Embeddings of previously indexed chunks, keyed by model and chunk text
+EMBEDDING_CACHE_FILENAME = "embedding_cache.pkl"
+
+# Cached embeddings kept at most; the least recently used are dropped first
+EMBEDDING_CACHE_MAX_ENTRIES = 5000
+
+# Directories with more files than this are read and chunked in a thread pool
+PARALLEL_READ_THRESHOLD = 8
+MAX_READ_WORKERS = 16
+
 
 class KnowledgeBaseIndexer:
     """Index knowledge base documents into vector store."""
 
-    def __init__(self):
-        """Initialize the indexer."""
+    def __init__(self, batch_size: int = None, chunk_tokens: int = None, overlap: int = None):
+        """
+        Initialize the indexer.
+
+        Args:
+            batch_size: Number of chunks embedded and added per batch
+            chunk_tokens: Maximum chunk size in tokens
+            overlap: Number of tokens shared by consecutive chunks
+        """
         self.vector_store = VectorStore()
         self.embedding_model = EmbeddingModel()
         self.knowledge_base_path = Path(__file__).parent / "knowledge_base"
+        self.batch_size = batch_size or settings.indexer_batch_size
+        self.chunk_tokens = chunk_tokens or settings.chunk_size
+        self.overlap = overlap if overlap is not None else settings.chunk_overlap
+        if not 0 <= self.overlap < self.chunk_tokens:
+            raise ValueError("overlap must be smaller than chunk_tokens")
+        self.manifest_path = Path(self.vector_store.persist_directory) / MANIFEST_FILENAME
+        self._manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+        self.embedding_cache_path = Path(self.vector_store.persist_directory) / EMBEDDING_CACHE_FILENAME
+        self._embedding_cache = self._load_embedding_cache()
+        self._embedding_cache_lock = threading.Lock()
+        # Cache keys of the chunks handled in the current run
+        self._seen_embedding_keys: Set[str] = set()
+
+    def _load_manifest(self) -> Dict[str, float]:
+        """Load the {collection/file: mtime} manifest of already indexed files."""
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable index manifest: {e}")
+            return {}
+
+    def _update_manifest(self, mtimes: Dict[str, float]):
+        """Record newly indexed files and persist the manifest."""
+        if not mtimes:
+            return
+
+        # Sections are indexed from several threads at once
+        with self._manifest_lock:
+            self._manifest.update(mtimes)
+            data = json.dumps(self._manifest, indent=2, sort_keys=True)
+            atomic_write(self.manifest_path, data.encode('utf-8'))
+
+    def _remove_from_manifest(self, keys: List[str]):
+        """Forget files that no longer exist and persist the manifest."""
+        if not keys:
+            return
+
+        with self._manifest_lock:
+            for key in keys:
+                self._manifest.pop(key, None)
+            data = json.dumps(self._manifest, indent=2, sort_keys=True)
+            atomic_write(self.manifest_path, data.encode('utf-8'))
+
+    def _load_embedding_cache(self) -> Dict[str, List[float]]:
+        """Load the persisted chunk embedding cache."""
+        try:
+            return pickle.loads(self.embedding_cache_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache: {e}")
+            return {}
+
+    def _save_embedding_cache(self):
+        """Persist the chunk embedding cache."""
+        # Copy first: other sections may add embeddings while this pickles
+        snapshot = self._embedding_cache.copy()
+        with self._embedding_cache_lock:
+            data = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            atomic_write(self.embedding_cache_path, data)
+
+    def _prune_embedding_cache(self, full_run: bool):
+        """
+        Drop embeddings that are no longer needed.
+
+        After a full run every chunk of the knowledge base has been seen,
+        so unseen entries belong to edited or deleted chunks. Incremental
+        runs skip unchanged files, so only the size cap applies to them.
+
+        Args:
+            full_run: Whether every file was re-chunked in this run
+        """
+        before = len(self._embedding_cache)
+        if full_run:
+            for key in self._embedding_cache.keys() - self._seen_embedding_keys:
+                del self._embedding_cache[key]
+
+        # Entries are kept in least-recently-used order
+        excess = len(self._embedding_cache) - EMBEDDING_CACHE_MAX_ENTRIES
+        for key in list(itertools.islice(self._embedding_cache, max(excess, 0))):
+            del self._embedding_cache[key]
+
+        self._seen_embedding_keys.clear()
+        if len(self._embedding_cache) < before:
+            logger.info(f"Pruned {before - len(self._embedding_cache)} cached embeddings")
+
+    def _missing_embeddings(self, documents: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Split documents into cache keys and the texts that still need embedding.
+
+        Returns:
+            Tuple of the cache key of every document and a {key: text} dict
+            of unique texts missing from the cache
+        """
+        model_id = f"{self.embedding_model.model_name}:{self.embedding_model.dimensions}"
+        keys = [
+            hashlib.md5(f"{model_id}\0{document}".encode()).hexdigest()
+            for document in documents
+        ]
+
+        missing = {}
+        for key, document in zip(keys, documents):
+            if key in self._embedding_cache:
+                # Move hits to the end so the size cap evicts unused entries
+                self._embedding_cache[key] = self._embedding_cache.pop(key)
+            else:
+                missing.setdefault(key, document)
+        self._seen_embedding_keys.update(keys)
+
+        logger.debug(f"Embedding cache: {len(documents) - len(missing)} hits, {len(missing)} misses")
+        return keys, missing
+
+    def _embed_chunks(self, documents: List[str]) -> List[List[float]]:
+        """
+        Embed chunks, reusing cached embeddings of identical chunks.
+
+        Args:
+            documents: Chunk texts
+
+        Returns:
+            Embeddings in document order
+        """
+        keys, missing = self._missing_embeddings(documents)
+        if missing:
+            embeddings = self.embedding_model.embed_documents(list(missing.values()))
+            self._embedding_cache.update(zip(missing, embeddings))
+
+        return [self._embedding_cache[key] for key in keys]
+
+    async def _aembed_chunks(
+        self,
+        documents: List[str],
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> List[List[float]]:
+        """Async variant of _embed_chunks, embedding the misses concurrently."""
+        keys, missing = self._missing_embeddings(documents)
+        if missing:
+            embeddings = await self.embedding_model.aembed_text(list(missing.values()), semaphore)
+            self._embedding_cache.update(zip(missing, embeddings))
+
+        return [self._embedding_cache[key] for key in keys]
 
     def _generate_doc_id(self, content: str, metadata: Dict[str, Any]) -> str:
         """Generate unique ID for a document."""
         unique_str = f"{content}{metadata.get('source', '')}"
         return hashlib.md5(unique_str.encode()).hexdigest()
 
-    def _chunk_document(self, content: str, chunk_size: int = 1000) -> List[str]:
+    def _chunk_document(self, content: str) -> List[str]:
         """
-        Chunk a document into smaller pieces.
+        Chunk a document into overlapping token windows.
+
+        Windows are counted with the embedding model's tokenizer, so every
+        chunk fits the embedding input limit.
 
         Args:
             content: Document content
-            chunk_size: Maximum chunk size in characters
 
         Returns:
             List of chunks
         """
-        # Simple chunking by paragraphs
-        paragraphs = content.split('\n\n')
+        encoding = get_encoding(self.embedding_model.model_name)
+        tokens = encoding.encode(content)
+        step = self.chunk_tokens - self.overlap
+
         chunks = []
-        current_chunk = ""
+        for start in range(0, len(tokens), step):
+            chunks.append(encoding.decode(tokens[start:start + self.chunk_tokens]).strip())
+            # The last window already reaches the end of the document
+            if start + self.chunk_tokens >= len(tokens):
+                break
 
-        for para in paragraphs:
-            if len(current_chunk) + len(para) > chunk_size and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = para
-            else:
-                current_chunk += "\n\n" + para if current_chunk else para
+        return chunks
+
+    def _read_and_chunk(self, md_file: Path) -> Optional[List[str]]:
+        """Read and chunk one markdown file, or return None if it fails."""
+        try:
+            return self._chunk_document(md_file.read_text())
+        except Exception as e:
+            logger.error(f"Error indexing {md_file}: {e}")
+            return None
+
+    def _collect_chunks(
+        self,
+        directory: Path,
+        collection_name: str,
+        metadata: Dict[str, Any] = None,
+        incremental: bool = True
+    ) -> Tuple[List[str], List[Dict[str, Any]], List[str], Dict[str, float]]:
+        """
+        Read and chunk the markdown files in a directory that need indexing.
 
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        Files whose mtime matches the manifest are skipped, stale chunks of
+        modified and deleted files are removed, and chunks whose ids are
+        already in the collection are dropped so they are not embedded again.
 
-        return chunks
+        Args:
+            directory: Directory containing markdown files
+            collection_name: Collection the files are indexed into
+            metadata: Additional metadata for all documents
+            incremental: If False, re-chunk every file and replace all of
+                its stored chunks
+
+        Returns:
+            Tuple of documents, metadatas, ids and the mtimes of the files read
+        """
+        documents = []
+        metadatas = []
+        ids = []
+        mtimes = {}
+
+        pending = []
+        seen_keys = set()
+        for md_file in directory.glob("*.md"):
+            try:
+                manifest_key = f"{collection_name}/{md_file.name}"
+                seen_keys.add(manifest_key)
+                mtime = md_file.stat().st_mtime
+                if incremental and self._manifest.get(manifest_key) == mtime:
+                    logger.debug(f"Skipping unchanged {md_file.name}")
+                    continue
+                if manifest_key in self._manifest or not incremental:
+                    self.vector_store.delete_documents(collection_name, {"source": md_file.name})
+                pending.append((md_file, manifest_key, mtime))
+
+            except Exception as e:
+                logger.error(f"Error indexing {md_file}: {e}")
 
-    def index_markdown_files(self, directory: Path, collection_name: str, metadata: Dict[str, Any] = None):
+        # Files indexed earlier but since deleted from the directory
+        removed = []
+        prefix = f"{collection_name}/"
+        with self._manifest_lock:
+            indexed_keys = list(self._manifest)
+        for manifest_key in indexed_keys:
+            if not manifest_key.startswith(prefix) or manifest_key in seen_keys:
+                continue
+            source = manifest_key[len(prefix):]
+            if self.vector_store.delete_documents(collection_name, {"source": source}):
+                removed.append(manifest_key)
+                logger.info(f"Removed chunks of deleted {source} from {collection_name}")
+        self._remove_from_manifest(removed)
+
+        files = [md_file for md_file, _, _ in pending]
+        if len(files) > PARALLEL_READ_THRESHOLD:
+            # File reads and the tokenizer both release the GIL
+            with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(files))) as executor:
+                file_chunks = list(executor.map(self._read_and_chunk, files))
+        else:
+            file_chunks = [self._read_and_chunk(md_file) for md_file in files]
+
+        for (md_file, manifest_key, mtime), chunks in zip(pending, file_chunks):
+            if chunks is None:
+                continue
+
+            for i, chunk in enumerate(chunks):
+                if not chunk.strip():
+                    continue
+
+                doc_metadata = {
+                    "source": str(md_file.name),
+                    "chunk_index": i,
+                    "total_chunks": len(chunks),
+                    **(metadata or {})
+                }
+
+                documents.append(chunk)
+                metadatas.append(doc_metadata)
+                ids.append(self._generate_doc_id(chunk, doc_metadata) + f"_{i}")
+
+            mtimes[manifest_key] = mtime
+            logger.info(f"Indexed {md_file.name} into {len(chunks)} chunks")
+
+        existing = self.vector_store.get_existing_ids(collection_name, ids) if incremental else set()
+        if existing:
+            keep = [i for i, doc_id in enumerate(ids) if doc_id not in existing]
+            documents = [documents[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+            ids = [ids[i] for i in keep]
+            logger.info(f"Skipping {len(existing)} chunks already in {collection_name}")
+
+        return documents, metadatas, ids, mtimes
+
+    def index_markdown_files(
+        self,
+        directory: Path,
+        collection_name: str,
+        metadata: Dict[str, Any] = None,
+        incremental: bool = True
+    ):
         """
         Index all markdown files in a directory.
 
@@ -63,46 +354,113 @@ class KnowledgeBaseIndexer:
             directory: Directory containing markdown files
             collection_name: Name of the collection
             metadata: Additional metadata for all documents
+            incremental: Only index new and modified files
         """
         if not directory.exists():
             logger.warning(f"Directory not found: {directory}")
             return
 
-        documents = []
-        metadatas = []
-        ids = []
+        documents, metadatas, ids, mtimes = self._collect_chunks(
+            directory, collection_name, metadata, incremental
+        )
 
-        for md_file in directory.glob("*.md"):
-            try:
-                content = md_file.read_text()
-                chunks = self._chunk_document(content)
+        if documents:
+            embeddings = self._embed_chunks(documents)
+            self._save_embedding_cache()
+            if not self._add_in_batches(collection_name, documents, metadatas, ids, embeddings):
+                return
+            logger.info(f"Added {len(documents)} documents to {collection_name}")
 
-                for i, chunk in enumerate(chunks):
-                    doc_metadata = {
-                        "source": str(md_file.name),
-                        "chunk_index": i,
-                        "total_chunks": len(chunks),
-                        **(metadata or {})
-                    }
+        self._update_manifest(mtimes)
 
-                    documents.append(chunk)
-                    metadatas.append(doc_metadata)
-                    ids.append(self._generate_doc_id(chunk, doc_metadata) + f"_{i}")
+    async def aindex_markdown_files(
+        self,
+        directory: Path,
+        collection_name: str,
+        metadata: Dict[str, Any] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        incremental: bool = True
+    ):
+        """
+        Index all markdown files in a directory, embedding batches concurrently.
 
-                logger.info(f"Indexed {md_file.name} into {len(chunks)} chunks")
+        Args:
+            directory: Directory containing markdown files
+            collection_name: Name of the collection
+            metadata: Additional metadata for all documents
+            semaphore: Bounds concurrent embedding requests
+            incremental: Only index new and modified files
+        """
+        if not directory.exists():
+            logger.warning(f"Directory not found: {directory}")
+            return
 
-            except Exception as e:
-                logger.error(f"Error indexing {md_file}: {e}")
+        documents, metadatas, ids, mtimes = await asyncio.to_thread(
+            self._collect_chunks, directory, collection_name, metadata, incremental
+        )
 
         if documents:
-            self.vector_store.add_documents(
+            embeddings = await self._aembed_chunks(documents, semaphore)
+            added = await self.vector_store.aupsert_documents(
                 collection_name=collection_name,
                 documents=documents,
                 metadatas=metadatas,
-                ids=ids
+                ids=ids,
+                embeddings=embeddings
             )
+            if not added:
+                return
             logger.info(f"Added {len(documents)} documents to {collection_name}")
 
+        await asyncio.to_thread(self._update_manifest, mtimes)
+
+    def _add_in_batches(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> bool:
+        """
+        Embed and upsert documents in fixed-size batches.
+
+        One embeddings request and one collection upsert are issued per
+        batch instead of per chunk. Upserting makes re-adding an existing
+        id (e.g. after a partially failed run) a harmless overwrite.
+
+        Args:
+            collection_name: Name of the collection
+            documents: List of document texts
+            metadatas: List of metadata dictionaries
+            ids: List of unique IDs
+            embeddings: Precomputed embeddings (embedded per batch if None)
+
+        Returns:
+            True if every batch was added
+        """
+        success = True
+        for start in range(0, len(documents), self.batch_size):
+            end = start + self.batch_size
+            batch_documents = documents[start:end]
+
+            if embeddings is None:
+                batch_embeddings = self.embedding_model.embed_documents(batch_documents)
+            else:
+                batch_embeddings = embeddings[start:end]
+
+            added = self.vector_store.upsert_documents(
+                collection_name=collection_name,
+                documents=batch_documents,
+                metadatas=metadatas[start:end],
+                ids=ids[start:end],
+                embeddings=batch_embeddings
+            )
+            success = success and added
+            logger.debug(f"Added batch of {len(batch_documents)} documents to {collection_name}")
+
+        return success
+
     def index_best_practices(self):
         """Index best practices documents."""
         logger.info("Indexing best practices...")
@@ -136,18 +494,46 @@ class KnowledgeBaseIndexer:
             metadata={"type": "review_example"}
         )
 
-    def index_all(self):
-        """Index all knowledge base content."""
+    async def aindex_all(self, incremental: bool = True):
+        """
+        Index all knowledge base sections concurrently.
+
+        Args:
+            incremental: Only index new and modified files
+        """
         logger.info("Starting full knowledge base indexing...")
 
-        self.index_best_practices()
-        self.index_code_patterns()
-        self.index_review_examples()
+        # One semaphore caps embedding requests across all sections
+        semaphore = asyncio.Semaphore(settings.embedding_max_concurrency)
+        await asyncio.gather(*[
+            self.aindex_markdown_files(
+                directory=self.knowledge_base_path / directory,
+                collection_name=collection_name,
+                metadata=metadata,
+                semaphore=semaphore,
+                incremental=incremental
+            )
+            for directory, collection_name, metadata in KNOWLEDGE_BASE_SECTIONS
+        ])
+
+        # Persisted once for all sections
+        self._prune_embedding_cache(full_run=not incremental)
+        await asyncio.to_thread(self._save_embedding_cache)
 
         logger.info("Knowledge base indexing complete!")
 
+    def index_all(self, incremental: bool = True):
+        """
+        Index all knowledge base content.
+
+        Args:
+            incremental: Only index new and modified files; if False every
+                file is re-chunked and its stored chunks are replaced
+        """
+        asyncio.run(self.aindex_all(incremental))
+
         # Print statistics
-        for collection in ["best_practices", "code_patterns", "review_examples"]:
+        for _, collection, _ in KNOWLEDGE_BASE_SECTIONS:
             count = self.vector_store.count_documents(collection)
             logger.info(f"{collection}: {count} documents")
 
@@ -155,8 +541,12 @@ class KnowledgeBaseIndexer:
         """Delete all collections and reindex."""
         logger.info("Resetting knowledge base...")
 
-        for collection in ["best_practices", "code_patterns", "review_examples"]:
+        for _, collection, _ in KNOWLEDGE_BASE_SECTIONS:
             self.vector_store.delete_collection(collection)
 
+        with self._manifest_lock:
+            self._manifest = {}
+            self.manifest_path.unlink(missing_ok=True)
+
         self.index_all()
 
@@ -0,0 +1,81 @@
+"""
+Cross-encoder re-ranking of retrieved documents.
+"""
+from functools import lru_cache
+from typing import List, Dict, Any, Set, TYPE_CHECKING
+import logging
+
+from src.config.settings import settings
+
+if TYPE_CHECKING:
+    from sentence_transformers import CrossEncoder
+
+logger = logging.getLogger(__name__)
+
+# Models that failed to load. lru_cache does not cache exceptions, so
+# without this every query would retry the (slow, failing) load.
+_failed_models: Set[str] = set()
+
+
+@lru_cache(maxsize=None)
+def _load_cross_encoder(model_name: str) -> "CrossEncoder":
+    """Load a cross-encoder once per process."""
+    from sentence_transformers import CrossEncoder
+
+    logger.info(f"Loading re-ranker model: {model_name}")
+    return CrossEncoder(model_name, max_length=512, device='cpu')
+
+
+class Reranker:
+    """Re-rank bi-encoder candidates with a cross-encoder."""
+
+    def __init__(self, model_name: str = None):
+        """
+        Initialize the re-ranker.
+
+        Args:
+            model_name: Name of the cross-encoder model
+        """
+        self.model_name = model_name or settings.rerank_model
+
+    def rerank(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-rank documents by cross-encoder relevance to the query.
+
+        Falls back to the original order if the model cannot be loaded;
+        a failed load is not retried for the rest of the process.
+
+        Args:
+            query: Search query
+            documents: Documents as returned by Retriever.retrieve
+            top_k: Number of documents to keep
+
+        Returns:
+            Top documents with a 'rerank_score' field, best first
+        """
+        if len(documents) <= 1 or self.model_name in _failed_models:
+            return documents[:top_k]
+
+        try:
+            model = _load_cross_encoder(self.model_name)
+        except Exception as e:
+            _failed_models.add(self.model_name)
+            logger.warning(f"Could not load re-ranker model, re-ranking disabled: {e}")
+            return documents[:top_k]
+
+        try:
+            scores = model.predict([(query, doc['content']) for doc in documents])
+        except Exception as e:
+            logger.warning(f"Re-ranking failed, using vector order: {e}")
+            return documents[:top_k]
+
+        for doc, score in zip(documents, scores):
+            doc['rerank_score'] = float(score)
+
+        ranked = sorted(documents, key=lambda d: d['rerank_score'], reverse=True)
+        return ranked[:top_k]
@@ -1,10 +1,13 @@
 """
 Document retrieval from vector store.
 """
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
 from src.rag.vector_store import VectorStore
+from src.rag.embeddings import EmbeddingModel
+from src.rag.reranker import Reranker
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -13,15 +16,24 @@ logger = logging.getLogger(__name__)
 class Retriever:
     """Retrieve relevant documents from vector store."""
 
-    def __init__(self, vector_store: Optional[VectorStore] = None):
+    def __init__(
+        self,
+        vector_store: Optional[VectorStore] = None,
+        embedding_model: Optional[EmbeddingModel] = None,
+        reranker: Optional[Reranker] = None
+    ):
         """
         Initialize the retriever.
 
         Args:
             vector_store: VectorStore instance
+            embedding_model: EmbeddingModel used to index the knowledge base
+            reranker: Cross-encoder re-ranker (defaults to one if enabled in settings)
         """
         self.vector_store = vector_store or VectorStore()
-        self.k = settings.retrieval_k
+        self.embedding_model = embedding_model or EmbeddingModel()
+        self.reranker = reranker or (Reranker() if settings.rerank_enabled else None)
+        self.k = settings.rerank_top_k if self.reranker else settings.retrieval_k
 
     def retrieve(
         self,
@@ -42,31 +54,13 @@ class Retriever:
         Returns:
             List of documents with metadata and scores
         """
-        k = k or self.k
-
         try:
-            results = self.vector_store.query(
-                collection_name=collection_name,
-                query_texts=[query],
-                n_results=k,
-                where=filters
-            )
-
-            # Format results
-            documents = []
-            if results and results.get('documents'):
-                docs = results['documents'][0]
-                metadatas = results.get('metadatas', [[]])[0]
-                distances = results.get('distances', [[]])[0]
-
-                for i, doc in enumerate(docs):
-                    documents.append({
-                        'content': doc,
-                        'metadata': metadatas[i] if i < len(metadatas) else {},
-                        'distance': distances[i] if i < len(distances) else 1.0,
-                        'relevance_score': 1.0 - (distances[i] if i < len(distances) else 1.0)
-                    })
+            # Embed with the same model the indexer used for the documents
+            query_embedding = self.embedding_model.embed_query(query)
+            if not query_embedding:
+                return []
 
+            documents = self._search(query, query_embedding, collection_name, k, filters)
             logger.info(f"Retrieved {len(documents)} documents for query")
             return documents
 
@@ -74,6 +68,144 @@ class Retriever:
             logger.error(f"Error retrieving documents: {e}")
             return []
 
+    def retrieve_multi(
+        self,
+        query: str,
+        specs: List[Tuple[str, Optional[Dict[str, Any]]]],
+        k: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve from several collections with a single query embedding.
+
+        The query is embedded once and the collection queries run in
+        parallel, so e.g. best practices, code patterns and review examples
+        cost one embedding call instead of three.
+
+        Args:
+            query: Search query
+            specs: (collection_name, filters) pairs to search
+            k: Number of results per collection
+
+        Returns:
+            Dict mapping collection name to its list of documents
+        """
+        if not specs:
+            return {}
+
+        try:
+            query_embedding = self.embedding_model.embed_query(query)
+        except Exception as e:
+            logger.error(f"Error embedding query: {e}")
+            query_embedding = []
+        if not query_embedding:
+            return {collection_name: [] for collection_name, _ in specs}
+
+        def search(collection_name: str, filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            try:
+                return self._search(query, query_embedding, collection_name, k, filters)
+            except Exception as e:
+                logger.error(f"Error retrieving from {collection_name}: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+            futures = {
+                collection_name: executor.submit(search, collection_name, filters)
+                for collection_name, filters in specs
+            }
+            results = {name: future.result() for name, future in futures.items()}
+
+        logger.info(
+            f"Retrieved {sum(len(docs) for docs in results.values())} documents "
+            f"from {len(results)} collections"
+        )
+        return results
+
+    def batch_retrieve(
+        self,
+        specs: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+        k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several different queries with a single embeddings request.
+
+        All queries are embedded in one API call and the collection
+        queries then run in parallel.
+
+        Args:
+            specs: (query, collection_name, filters) triples
+            k: Number of results per query
+
+        Returns:
+            List of document lists, in the same order as specs
+        """
+        if not specs:
+            return []
+
+        try:
+            query_embeddings = self.embedding_model.embed_queries([query for query, _, _ in specs])
+        except Exception as e:
+            logger.error(f"Error embedding queries: {e}")
+            return [[] for _ in specs]
+
+        def search(
+            spec: Tuple[str, str, Optional[Dict[str, Any]]],
+            query_embedding: List[float]
+        ) -> List[Dict[str, Any]]:
+            query, collection_name, filters = spec
+            if not query_embedding:
+                return []
+            try:
+                return self._search(query, query_embedding, collection_name, k, filters)
+            except Exception as e:
+                logger.error(f"Error retrieving from {collection_name}: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+            results = list(executor.map(search, specs, query_embeddings))
+
+        logger.info(f"Retrieved {sum(len(docs) for docs in results)} documents for {len(specs)} queries")
+        return results
+
+    def _search(
+        self,
+        query: str,
+        query_embedding: List[float],
+        collection_name: str,
+        k: Optional[int],
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Query one collection with a precomputed embedding and format the hits."""
+        k = k or self.k
+        # Over-fetch candidates when a re-ranker will pick the final k
+        n_results = max(k, settings.rerank_candidates) if self.reranker else k
+
+        results = self.vector_store.query(
+            collection_name=collection_name,
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            where=filters or None
+        )
+
+        # Format results
+        documents = []
+        if results and results.get('documents'):
+            docs = results['documents'][0]
+            metadatas = results.get('metadatas', [[]])[0]
+            distances = results.get('distances', [[]])[0]
+
+            for i, doc in enumerate(docs):
+                documents.append({
+                    'content': doc,
+                    'metadata': metadatas[i] if i < len(metadatas) else {},
+                    'distance': distances[i] if i < len(distances) else 1.0,
+                    'relevance_score': 1.0 - (distances[i] if i < len(distances) else 1.0)
+                })
+
+        if self.reranker:
+            documents = self.reranker.rerank(query, documents, top_k=k)
+
+        return documents
+
     def retrieve_by_language(
         self,
         query: str,
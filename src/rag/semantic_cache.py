@@ -0,0 +1,243 @@
+"""
+Semantic cache for short-circuiting near-duplicate PR reviews.
+"""
+import hashlib
+import struct
+import time
+import uuid
+import zlib
+from typing import List, Dict, Any, Optional
+import logging
+
+from src.rag.vector_store import VectorStore
+from src.rag.embeddings import EmbeddingModel
+from src.data_preparation.base_adapter import PullRequest
+from src.data_preparation.diff_parser import file_extension
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Characters of patch text embedded into the cache key
+KEY_PATCH_CHARS = 4000
+
+
+class SemanticCache:
+    """Cache review results keyed by an embedding of the PR's changes."""
+
+    COLLECTION_NAME = "pr_review_cache"
+
+    def __init__(
+        self,
+        vector_store: Optional[VectorStore] = None,
+        embedding_model: Optional[EmbeddingModel] = None,
+        threshold: Optional[float] = None,
+        ttl_seconds: Optional[int] = None
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            vector_store: VectorStore instance
+            embedding_model: EmbeddingModel instance
+            threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Maximum age of a cache entry
+        """
+        self.vector_store = vector_store or VectorStore()
+        self.embedding_model = embedding_model or EmbeddingModel()
+        self.threshold = threshold if threshold is not None else settings.semantic_cache_threshold
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.semantic_cache_ttl
+
+    @staticmethod
+    def fingerprint(pr: PullRequest) -> Optional[str]:
+        """
+        Fingerprint the PR's patches for exact cache hits.
+
+        Each file gets a cheap CRC32 over its name and patch; the packed
+        checksums are then hashed once with SHA-256, together with the
+        repository, instead of running SHA-256 over every patch.
+
+        Returns:
+            Fingerprint, or None when no file has patch text (e.g. Bitbucket
+            PRs or binary-only changes), since those PRs are not comparable
+        """
+        checksums = [
+            zlib.crc32(
+                file_change.patch.encode('utf-8'),
+                zlib.crc32(file_change.filename.encode('utf-8'))
+            )
+            for file_change in pr.files_changed
+            if file_change.patch
+        ]
+        if not checksums:
+            return None
+
+        packed = struct.pack(f"<{len(checksums)}I", *checksums)
+        return hashlib.sha256(pr.repository.encode('utf-8') + b"\0" + packed).hexdigest()[:32]
+
+    def build_key_text(self, pr: PullRequest, change_summary: Dict[str, int]) -> str:
+        """
+        Build the text that is embedded as the cache key.
+
+        The key carries the start of the patch text, so similarity follows
+        the changed hunks; the exact fingerprint is kept in metadata.
+
+        Args:
+            pr: Pull request under review
+            change_summary: Change summary from DiffParser
+
+        Returns:
+            Cache key text
+        """
+        extensions = sorted({
+            file_extension(f.filename) or 'no_extension'
+            for f in pr.files_changed
+        })
+        patches = "\n".join(f.patch for f in pr.files_changed if f.patch)
+        return "\n".join([
+            pr.title,
+            str(change_summary),
+            str(extensions),
+            patches[:KEY_PATCH_CHARS]
+        ])
+
+    def embed_key(self, key_text: str) -> List[float]:
+        """
+        Embed a cache key.
+
+        Args:
+            key_text: Cache key text
+
+        Returns:
+            Embedding vector, or an empty list if embedding failed
+        """
+        try:
+            return self.embedding_model.embed_query(key_text)
+        except Exception as e:
+            logger.warning(f"Semantic cache key embedding failed: {e}")
+            return []
+
+    def lookup_exact(self, fingerprint: Optional[str]) -> Optional[str]:
+        """
+        Look up a cached review for identical patches, without embedding.
+
+        Args:
+            fingerprint: Patch fingerprint from fingerprint()
+
+        Returns:
+            Cached review text, or None on a miss
+        """
+        if not fingerprint:
+            return None
+
+        try:
+            collection = self.vector_store.get_or_create_collection(self.COLLECTION_NAME)
+            results = collection.get(
+                where={"$and": [
+                    {"fingerprint": fingerprint},
+                    {"created_at": {"$gte": time.time() - self.ttl_seconds}}
+                ]},
+                limit=1,
+                include=["metadatas"]
+            )
+
+            metadatas = results.get('metadatas') or []
+            if metadatas:
+                logger.info("Semantic cache exact hit")
+                return metadatas[0].get('review')
+
+            return None
+
+        except Exception as e:
+            logger.warning(f"Semantic cache exact lookup failed: {e}")
+            return None
+
+    def lookup(self, embedding: List[float], repository: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached review for a near-duplicate key.
+
+        Args:
+            embedding: Embedded cache key
+            repository: Only match reviews of this repository, so look-alike
+                PRs (e.g. dependency bumps) in other repositories never hit
+
+        Returns:
+            Cached review text, or None on a miss
+        """
+        if not embedding:
+            return None
+
+        try:
+            collection = self.vector_store.get_or_create_collection(self.COLLECTION_NAME)
+            if collection.count() == 0:
+                return None
+
+            where = {"created_at": {"$gte": time.time() - self.ttl_seconds}}
+            if repository:
+                where = {"$and": [where, {"repository": repository}]}
+
+            results = collection.query(
+                query_embeddings=[embedding],
+                n_results=1,
+                where=where
+            )
+
+            distances = results.get('distances') or [[]]
+            metadatas = results.get('metadatas') or [[]]
+            if not distances[0]:
+                return None
+
+            if distances[0][0] < 1.0 - self.threshold:
+                logger.info(f"Semantic cache hit (distance={distances[0][0]:.4f})")
+                return metadatas[0][0].get('review')
+
+            return None
+
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    def store(
+        self,
+        embedding: List[float],
+        key_text: str,
+        review: str,
+        fingerprint: Optional[str] = None,
+        repository: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Store a review result under the given key.
+
+        Args:
+            embedding: Embedded cache key
+            key_text: Cache key text
+            review: Review text to cache
+            fingerprint: Patch fingerprint for exact lookups
+            repository: Repository the review belongs to, for scoped lookups
+            metadata: Additional metadata for the entry
+
+        Returns:
+            True if successful
+        """
+        if not embedding:
+            return False
+
+        try:
+            collection = self.vector_store.get_or_create_collection(self.COLLECTION_NAME)
+            collection.add(
+                ids=[uuid.uuid4().hex],
+                embeddings=[embedding],
+                documents=[key_text],
+                metadatas=[{
+                    "review": review,
+                    "created_at": time.time(),
+                    **({"fingerprint": fingerprint} if fingerprint else {}),
+                    **({"repository": repository} if repository else {}),
+                    **(metadata or {})
+                }]
+            )
+            return True
+
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {e}")
+            return False
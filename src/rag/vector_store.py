@@ -1,16 +1,61 @@
 """
 Vector store management using ChromaDB.
 """
-import chromadb
-from chromadb.config import Settings
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple, Union, TYPE_CHECKING
+import asyncio
+import json
 import logging
+import threading
 from pathlib import Path
 
 from src.config.settings import settings as app_settings
 
+# chromadb (Rust bindings included) is imported when a VectorStore is
+# created, so importing this module stays cheap
+if TYPE_CHECKING:
+    import chromadb
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Precomputed vectors: lists of floats or a 2-D numpy array, which Chroma
+# accepts as is (no conversion to Python lists)
+Embeddings = Union[Sequence[Sequence[float]], "np.ndarray"]
+
+# Metadata as one dict per row, or columnar as {field: values} (lists or
+# numpy arrays); columnar metadata is turned into rows one batch at a time
+Metadatas = Union[List[Dict[str, Any]], Dict[str, Sequence[Any]]]
+
+# Per-query fields of a Chroma query result (each holds one list per query)
+_PER_QUERY_FIELDS = ("ids", "documents", "metadatas", "distances", "embeddings", "uris", "data")
+
+
+def _slice_rows(values: Optional[Sequence[Any]], start: int, end: int) -> Optional[List[Any]]:
+    """Slice ids or documents for one write, unpacking numpy arrays to Python values."""
+    if values is None:
+        return None
+    batch = values[start:end]
+    return batch.tolist() if hasattr(batch, "tolist") else batch
+
+
+def _slice_metadatas(metadatas: Metadatas, start: int, end: int) -> List[Dict[str, Any]]:
+    """Slice metadata for one write, building row dicts only for that slice."""
+    if not isinstance(metadatas, dict):
+        return metadatas[start:end]
+    fields = list(metadatas)
+    columns = [_slice_rows(metadatas[field], start, end) for field in fields]
+    return [dict(zip(fields, row)) for row in zip(*columns)]
+
+
+def _take(values: Optional[Sequence[Any]], positions: List[int]) -> Optional[Sequence[Any]]:
+    """Select rows by position from a list or numpy array."""
+    if values is None:
+        return None
+    if hasattr(values, "shape"):
+        return values[positions]
+    return [values[position] for position in positions]
+
 
 class VectorStore:
     """Manages the ChromaDB vector store for code review knowledge."""
@@ -25,6 +70,9 @@ class VectorStore:
         self.persist_directory = persist_directory or app_settings.chroma_persist_directory
         Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
 
+        import chromadb
+        from chromadb.config import Settings
+
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
             path=self.persist_directory,
@@ -34,95 +82,496 @@ class VectorStore:
             )
         )
 
+        # Collection handles by name, so each call skips the sysdb lookup
+        self._collections: Dict[str, "chromadb.Collection"] = {}
+        self._collections_lock = threading.Lock()
+
         logger.info(f"Initialized vector store at {self.persist_directory}")
 
-    def get_or_create_collection(self, name: str) -> chromadb.Collection:
+    def get_or_create_collection(self, name: str) -> "chromadb.Collection":
         """
         Get or create a collection.
 
+        Handles are cached per name; the cache entry is dropped when the
+        collection is deleted or an operation on it fails.
+
         Args:
             name: Collection name
 
         Returns:
             ChromaDB collection
         """
-        try:
-            collection = self.client.get_or_create_collection(
-                name=name,
-                metadata={"hnsw:space": "cosine"}
-            )
-            logger.info(f"Using collection: {name}")
+        collection = self._collections.get(name)
+        if collection is not None:
             return collection
+
+        with self._collections_lock:
+            collection = self._collections.get(name)
+            if collection is not None:
+                return collection
+
+            try:
+                collection = self.client.get_or_create_collection(
+                    name=name,
+                    metadata={"hnsw:space": "cosine"}
+                )
+                logger.info(f"Using collection: {name}")
+                self._collections[name] = collection
+                return collection
+            except Exception as e:
+                logger.error(f"Error getting/creating collection: {e}")
+                raise
+
+    def _forget_collection(self, name: str):
+        """Drop a cached handle, e.g. after the collection was deleted elsewhere."""
+        with self._collections_lock:
+            self._collections.pop(name, None)
+
+    def _write_in_batches(
+        self,
+        operation: str,
+        collection_name: str,
+        documents: Optional[Sequence[str]],
+        metadatas: Metadatas,
+        ids: Sequence[str],
+        embeddings: Optional[Embeddings],
+        batch_size: Optional[int],
+        max_workers: Optional[int]
+    ) -> bool:
+        """
+        Add or upsert documents in fixed-size sub-batches.
+
+        Chroma pays a high fixed cost per write call, so very large calls
+        are split into batches of chroma_add_batch_size and one write is
+        issued per batch. Several batches are written from a thread pool
+        so batch serialization overlaps Chroma's own I/O. numpy ids or
+        documents and columnar metadata are converted a batch at a time,
+        so a large load never holds every row as Python objects at once.
+        Adds skip IDs the collection already holds (and repeats within a
+        batch), so re-adding indexed chunks never reaches the HNSW index.
+
+        Args:
+            operation: Collection method to call ("add" or "upsert")
+            collection_name: Name of the collection
+            documents: List of document texts
+            metadatas: Metadata dictionaries, or columnar {field: values}
+            ids: Unique IDs (a list or numpy array)
+            embeddings: Optional precomputed embeddings
+            batch_size: Sub-batch size (defaults to settings)
+            max_workers: Concurrent writes (defaults to settings)
+
+        Returns:
+            True if successful
+        """
+        batch_size = batch_size or app_settings.chroma_add_batch_size
+        starts = range(0, len(ids), batch_size)
+        max_workers = min(max_workers or app_settings.chroma_max_write_workers, len(starts))
+
+        try:
+            collection = self.get_or_create_collection(collection_name)
+            write = getattr(collection, operation)
+
+            def write_batch(start: int):
+                end = start + batch_size
+                batch_documents = _slice_rows(documents, start, end)
+                batch_metadatas = _slice_metadatas(metadatas, start, end)
+                batch_ids = _slice_rows(ids, start, end)
+                batch_embeddings = embeddings[start:end] if embeddings is not None else None
+
+                if operation == "add":
+                    positions = self._new_positions(collection, batch_ids)
+                    if not positions:
+                        return
+                    if len(positions) < len(batch_ids):
+                        logger.debug(
+                            f"Skipping {len(batch_ids) - len(positions)} existing or repeated IDs"
+                        )
+                        batch_documents = _take(batch_documents, positions)
+                        batch_metadatas = _take(batch_metadatas, positions)
+                        batch_ids = _take(batch_ids, positions)
+                        batch_embeddings = _take(batch_embeddings, positions)
+
+                write(
+                    documents=batch_documents,
+                    metadatas=batch_metadatas,
+                    ids=batch_ids,
+                    embeddings=batch_embeddings
+                )
+
+            if max_workers <= 1:
+                for start in starts:
+                    write_batch(start)
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # Consuming the results re-raises the first failed write
+                    list(executor.map(write_batch, starts))
+            return True
         except Exception as e:
-            logger.error(f"Error getting/creating collection: {e}")
-            raise
+            logger.error(f"Error writing documents ({operation}): {e}")
+            self._forget_collection(collection_name)
+            return False
+
+    @staticmethod
+    def _new_positions(collection: "chromadb.Collection", ids: List[str]) -> List[int]:
+        """
+        Find the rows of a batch whose IDs are not stored yet.
+
+        Args:
+            collection: Collection being written
+            ids: Batch IDs
+
+        Returns:
+            Positions of the first occurrence of each new ID
+        """
+        first_seen: Dict[str, int] = {}
+        for position, doc_id in enumerate(ids):
+            first_seen.setdefault(doc_id, position)
+
+        existing = set(collection.get(ids=list(first_seen), include=[])["ids"])
+        return [position for doc_id, position in first_seen.items() if doc_id not in existing]
 
     def add_documents(
         self,
         collection_name: str,
-        documents: List[str],
-        metadatas: List[Dict[str, Any]],
-        ids: List[str]
+        documents: Optional[Sequence[str]],
+        metadatas: Metadatas,
+        ids: Sequence[str],
+        embeddings: Optional[Embeddings] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None
     ) -> bool:
         """
-        Add documents to a collection.
+        Add documents to a collection, skipping IDs it already holds.
 
         Args:
             collection_name: Name of the collection
-            documents: List of document texts
-            metadatas: List of metadata dictionaries
-            ids: List of unique IDs
+            documents: List of document texts (may be None when embeddings
+                are given and only the vectors are needed)
+            metadatas: Metadata dictionaries, or columnar {field: values}
+            ids: Unique IDs (a list or numpy array)
+            embeddings: Optional precomputed embeddings, as lists or a numpy
+                array (skips Chroma's embedder)
+            batch_size: Documents per Chroma write (defaults to settings)
+            max_workers: Concurrent Chroma writes (defaults to settings)
 
         Returns:
             True if successful
         """
+        if not self._write_in_batches(
+            "add", collection_name, documents, metadatas, ids, embeddings, batch_size, max_workers
+        ):
+            return False
+        logger.info(f"Added {len(ids)} documents to {collection_name}")
+        return True
+
+    def upsert_documents(
+        self,
+        collection_name: str,
+        documents: Optional[Sequence[str]],
+        metadatas: Metadatas,
+        ids: Sequence[str],
+        embeddings: Optional[Embeddings] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> bool:
+        """
+        Add documents to a collection, overwriting any with the same IDs.
+
+        Args:
+            collection_name: Name of the collection
+            documents: List of document texts (may be None when embeddings
+                are given and only the vectors are needed)
+            metadatas: Metadata dictionaries, or columnar {field: values}
+            ids: Unique IDs (a list or numpy array)
+            embeddings: Optional precomputed embeddings, as lists or a numpy
+                array (skips Chroma's embedder)
+            batch_size: Documents per Chroma write (defaults to settings)
+            max_workers: Concurrent Chroma writes (defaults to settings)
+
+        Returns:
+            True if successful
+        """
+        if not self._write_in_batches(
+            "upsert", collection_name, documents, metadatas, ids, embeddings, batch_size, max_workers
+        ):
+            return False
+        logger.info(f"Upserted {len(ids)} documents to {collection_name}")
+        return True
+
+    async def _awrite_in_batches(
+        self,
+        operation: str,
+        collection_name: str,
+        documents: Optional[Sequence[str]],
+        metadatas: Metadatas,
+        ids: Sequence[str],
+        embeddings: Optional[Embeddings],
+        batch_size: Optional[int],
+        max_workers: Optional[int]
+    ) -> bool:
+        """
+        Async variant of _write_in_batches.
+
+        Each sub-batch is written in a worker thread, with at most
+        max_workers writes in flight, so the event loop stays free while
+        Chroma persists.
+        """
+        batch_size = batch_size or app_settings.chroma_add_batch_size
+        semaphore = asyncio.Semaphore(max_workers or app_settings.chroma_max_write_workers)
+
+        async def write_batch(start: int) -> bool:
+            end = start + batch_size
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._write_in_batches,
+                    operation,
+                    collection_name,
+                    _slice_rows(documents, start, end),
+                    _slice_metadatas(metadatas, start, end),
+                    _slice_rows(ids, start, end),
+                    embeddings[start:end] if embeddings is not None else None,
+                    batch_size,
+                    1
+                )
+
+        results = await asyncio.gather(*[
+            write_batch(start) for start in range(0, len(ids), batch_size)
+        ])
+        return all(results)
+
+    async def aadd_documents(
+        self,
+        collection_name: str,
+        documents: Optional[Sequence[str]],
+        metadatas: Metadatas,
+        ids: Sequence[str],
+        embeddings: Optional[Embeddings] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> bool:
+        """
+        Add documents to a collection without blocking the event loop.
+
+        Args:
+            collection_name: Name of the collection
+            documents: List of document texts (may be None when embeddings
+                are given and only the vectors are needed)
+            metadatas: Metadata dictionaries, or columnar {field: values}
+            ids: Unique IDs (a list or numpy array)
+            embeddings: Optional precomputed embeddings, as lists or a numpy
+                array (skips Chroma's embedder)
+            batch_size: Documents per Chroma write (defaults to settings)
+            max_workers: Concurrent Chroma writes (defaults to settings)
+
+        Returns:
+            True if successful
+        """
+        if not await self._awrite_in_batches(
+            "add", collection_name, documents, metadatas, ids, embeddings, batch_size, max_workers
+        ):
+            return False
+        logger.info(f"Added {len(ids)} documents to {collection_name}")
+        return True
+
+    async def aupsert_documents(
+        self,
+        collection_name: str,
+        documents: Optional[Sequence[str]],
+        metadatas: Metadatas,
+        ids: Sequence[str],
+        embeddings: Optional[Embeddings] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> bool:
+        """
+        Upsert documents into a collection without blocking the event loop.
+
+        Args:
+            collection_name: Name of the collection
+            documents: List of document texts (may be None when embeddings
+                are given and only the vectors are needed)
+            metadatas: Metadata dictionaries, or columnar {field: values}
+            ids: Unique IDs (a list or numpy array)
+            embeddings: Optional precomputed embeddings, as lists or a numpy
+                array (skips Chroma's embedder)
+            batch_size: Documents per Chroma write (defaults to settings)
+            max_workers: Concurrent Chroma writes (defaults to settings)
+
+        Returns:
+            True if successful
+        """
+        if not await self._awrite_in_batches(
+            "upsert", collection_name, documents, metadatas, ids, embeddings, batch_size, max_workers
+        ):
+            return False
+        logger.info(f"Upserted {len(ids)} documents to {collection_name}")
+        return True
+
+    def get_existing_ids(self, collection_name: str, ids: List[str]) -> Set[str]:
+        """
+        Find which of the given IDs are already stored in a collection.
+
+        Args:
+            collection_name: Name of the collection
+            ids: Candidate IDs
+
+        Returns:
+            Set of IDs present in the collection
+        """
+        if not ids:
+            return set()
+
         try:
             collection = self.get_or_create_collection(collection_name)
-            collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
-            logger.info(f"Added {len(documents)} documents to {collection_name}")
+            return set(collection.get(ids=ids, include=[])['ids'])
+        except Exception as e:
+            logger.error(f"Error looking up document IDs: {e}")
+            self._forget_collection(collection_name)
+            return set()
+
+    def delete_documents(self, collection_name: str, where: Dict[str, Any]) -> bool:
+        """
+        Delete documents matching a metadata filter.
+
+        Args:
+            collection_name: Name of the collection
+            where: Metadata filter selecting the documents to delete
+
+        Returns:
+            True if successful
+        """
+        try:
+            collection = self.get_or_create_collection(collection_name)
+            collection.delete(where=where)
             return True
         except Exception as e:
-            logger.error(f"Error adding documents: {e}")
+            logger.error(f"Error deleting documents: {e}")
+            self._forget_collection(collection_name)
             return False
 
     def query(
         self,
         collection_name: str,
-        query_texts: List[str],
+        query_texts: Optional[List[str]] = None,
         n_results: int = 5,
-        where: Optional[Dict[str, Any]] = None
+        where: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[Embeddings] = None,
+        as_arrays: bool = False
     ) -> Dict[str, Any]:
         """
         Query the vector store.
 
         Args:
             collection_name: Name of the collection
-            query_texts: List of query texts
+            query_texts: List of query texts (embedded by Chroma)
             n_results: Number of results to return
             where: Optional metadata filter
+            query_embeddings: Precomputed query embeddings; must come from the
+                same model used to embed the collection
+            as_arrays: Return the first query's hits flattened, with ids and
+                distances as numpy arrays, for callers that filter or rank
+                large result sets vectorized
 
         Returns:
-            Query results
+            Query results (see _to_arrays for the as_arrays shape)
         """
         try:
             collection = self.get_or_create_collection(collection_name)
-            results = collection.query(
-                query_texts=query_texts,
-                n_results=n_results,
-                where=where
-            )
+            if query_embeddings is not None:
+                results = collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=n_results,
+                    where=where
+                )
+            else:
+                results = collection.query(
+                    query_texts=query_texts,
+                    n_results=n_results,
+                    where=where
+                )
             logger.debug(f"Query returned {len(results.get('documents', [[]])[0])} results")
-            return results
+            return self._to_arrays(results) if as_arrays else results
         except Exception as e:
             logger.error(f"Error querying collection: {e}")
-            return {"documents": [], "metadatas": [], "distances": []}
+            self._forget_collection(collection_name)
+            empty = {"documents": [], "metadatas": [], "distances": []}
+            return self._to_arrays(empty) if as_arrays else empty
+
+    @staticmethod
+    def _to_arrays(results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Flatten the first query of a Chroma result into numpy buffers.
+
+        Args:
+            results: Query result with one list per query
+
+        Returns:
+            Dict with "ids" (str array), "distances" (float32 array) and
+            "documents"/"metadatas" lists, all for the first query only
+        """
+        import numpy as np
+
+        def first(field: str) -> List[Any]:
+            values = results.get(field) or [[]]
+            return values[0] or []
+
+        return {
+            "ids": np.asarray(first("ids"), dtype=str),
+            "distances": np.asarray(first("distances"), dtype=np.float32),
+            "documents": first("documents"),
+            "metadatas": first("metadatas")
+        }
+
+    def query_many(
+        self,
+        collection_name: str,
+        query_embeddings: Embeddings,
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several vector queries against a collection in one Chroma call.
+
+        Identical vectors are sent once, and the batched result is split
+        back into one result per input query.
+
+        Args:
+            collection_name: Name of the collection
+            query_embeddings: Query vectors
+            n_results: Number of results per query
+            where: Optional metadata filter shared by all queries
+
+        Returns:
+            One query result per input vector, in the shape returned by query
+        """
+        unique: Dict[Tuple[float, ...], int] = {}
+        positions = [unique.setdefault(tuple(vector), len(unique)) for vector in query_embeddings]
+        if not unique:
+            return []
+
+        results = self.query(
+            collection_name=collection_name,
+            n_results=n_results,
+            where=where,
+            query_embeddings=[list(vector) for vector in unique]
+        )
+
+        split = {
+            field: results[field]
+            for field in _PER_QUERY_FIELDS
+            if field in results
+        }
+        return [
+            {
+                field: [values[position]] if values is not None and len(values) else values
+                for field, values in split.items()
+            }
+            for position in positions
+        ]
 
     def delete_collection(self, name: str) -> bool:
         """Delete a collection."""
+        self._forget_collection(name)
         try:
             self.client.delete_collection(name)
             logger.info(f"Deleted collection: {name}")
@@ -147,5 +596,103 @@ class VectorStore:
             return collection.count()
         except Exception as e:
             logger.error(f"Error counting documents: {e}")
+            self._forget_collection(collection_name)
             return 0
 
+
+class QueryBatcher:
+    """
+    Coalesce concurrent single-vector queries into batched Chroma calls.
+
+    Queries for the same collection, n_results and filter that arrive
+    within a short window are sent as one VectorStore.query_many call.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        max_batch_size: int = 32,
+        window_seconds: float = 0.005
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            vector_store: VectorStore to query
+            max_batch_size: Queries that trigger an immediate flush
+            window_seconds: How long to wait for more queries to batch
+        """
+        self.vector_store = vector_store
+        self.max_batch_size = max_batch_size
+        self.window_seconds = window_seconds
+        self._pending: Dict[Tuple[str, int, str], List[Tuple[List[float], asyncio.Future]]] = {}
+        # The event loop only holds weak references to tasks; keep in-flight
+        # batches alive until they resolve their callers
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def query(
+        self,
+        collection_name: str,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query a collection, batched with other concurrent queries.
+
+        Args:
+            collection_name: Name of the collection
+            query_embedding: Query vector
+            n_results: Number of results to return
+            where: Optional metadata filter
+
+        Returns:
+            Query results, as returned by VectorStore.query
+        """
+        loop = asyncio.get_running_loop()
+        key = (collection_name, n_results, json.dumps(where, sort_keys=True, default=str))
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((query_embedding, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key, where)
+        elif len(batch) == 1:
+            loop.call_later(self.window_seconds, self._flush, key, where)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, int, str], where: Optional[Dict[str, Any]]):
+        """Send the pending batch for a key, if any."""
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._run(key, where, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        key: Tuple[str, int, str],
+        where: Optional[Dict[str, Any]],
+        batch: List[Tuple[List[float], asyncio.Future]]
+    ):
+        """Run one batched query and resolve the waiting callers."""
+        collection_name, n_results, _ = key
+        try:
+            results = await asyncio.to_thread(
+                self.vector_store.query_many,
+                collection_name,
+                [embedding for embedding, _ in batch],
+                n_results,
+                where
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Batched {len(batch)} queries on {collection_name}")
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
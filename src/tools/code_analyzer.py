@@ -1,15 +1,212 @@
 """
 Code analysis tools integration.
 """
+import ast
+import builtins
+import shutil
 import subprocess
 import json
+import os
+import re
 from typing import List, Dict, Any
 import logging
 from pathlib import Path
 import tempfile
 
+# pyflakes and pycodestyle (flake8's own checkers) run in-process when
+# installed; otherwise the flake8 executable is used
+try:
+    import pycodestyle
+    from pyflakes import api as pyflakes_api
+    from pyflakes import reporter as pyflakes_reporter
+except ImportError:
+    pycodestyle = None
+    pyflakes_api = None
+    pyflakes_reporter = None
+
 logger = logging.getLogger(__name__)
 
+# Snippets shorter than this are linted with the AST checks below rather
+# than by starting a flake8 process
+FAST_LINT_MAX_LINES = 200
+
+# One "path:line:col: message" line of flake8's default output
+_FLAKE8_RE = re.compile(r'^([^:\n]+):(\d+):(\d+):[ \t]*(.*)$', re.MULTILINE)
+
+# Names every module can use without binding them
+_IMPLICIT_NAMES = frozenset(dir(builtins)) | {
+    '__file__', '__name__', '__doc__', '__builtins__', '__spec__',
+    '__loader__', '__package__', '__path__', '__annotations__'
+}
+
+
+class _FastLint(ast.NodeVisitor):
+    """
+    Minimal AST lint: unused imports, undefined names and bare excepts.
+
+    Names are tracked per module rather than per scope, so it reports
+    fewer undefined names than pyflakes, but never needs a subprocess.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.issues: List[Dict[str, Any]] = []
+        self._imports: Dict[str, ast.AST] = {}
+        self._bound = set()
+        self._loaded: Dict[str, ast.Name] = {}
+        self._exported = set()
+        self._star_import = False
+
+    def _issue(self, node: ast.AST, message: str):
+        self.issues.append({
+            'tool': 'ast',
+            'file': self.filename,
+            'line': getattr(node, 'lineno', 0),
+            'column': getattr(node, 'col_offset', 0) + 1,
+            'message': message,
+            'severity': 'warning'
+        })
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            name = alias.asname or alias.name.split('.')[0]
+            self._imports.setdefault(name, node)
+            self._bound.add(name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            if alias.name == '*':
+                self._star_import = True
+            elif node.module != '__future__':
+                name = alias.asname or alias.name
+                self._imports.setdefault(name, node)
+                self._bound.add(name)
+
+    def _visit_definition(self, node):
+        self._bound.add(node.name)
+        self.generic_visit(node)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_definition
+
+    def visit_arg(self, node: ast.arg):
+        self._bound.add(node.arg)
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        if isinstance(node.ctx, ast.Load):
+            self._loaded.setdefault(node.id, node)
+        else:
+            self._bound.add(node.id)
+
+    def visit_Global(self, node: ast.Global):
+        self._bound.update(node.names)
+
+    visit_Nonlocal = visit_Global
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.type is None:
+            self._issue(node, "bare 'except:' clause")
+        if node.name:
+            self._bound.add(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node: ast.MatchAs):
+        if node.name:
+            self._bound.add(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node: ast.MatchStar):
+        if node.name:
+            self._bound.add(node.name)
+
+    def visit_MatchMapping(self, node: ast.MatchMapping):
+        if node.rest:
+            self._bound.add(node.rest)
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign):
+        # Names listed in __all__ count as used
+        if any(isinstance(t, ast.Name) and t.id == '__all__' for t in node.targets):
+            if isinstance(node.value, (ast.List, ast.Tuple)):
+                self._exported.update(
+                    elt.value for elt in node.value.elts
+                    if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+                )
+        self.generic_visit(node)
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Report the module-level findings after the tree is visited."""
+        for name, node in self._imports.items():
+            if name not in self._loaded and name not in self._exported:
+                self._issue(node, f"'{name}' imported but unused")
+
+        if not self._star_import:
+            for name, node in self._loaded.items():
+                if name not in self._bound and name not in _IMPLICIT_NAMES:
+                    self._issue(node, f"undefined name '{name}'")
+
+        self.issues.sort(key=lambda issue: (issue['line'], issue['column']))
+        return self.issues
+
+
+if pycodestyle is not None:
+    class _StyleReport(pycodestyle.BaseReport):
+        """pycodestyle report that collects issues instead of printing them."""
+
+        def __init__(self, options):
+            super().__init__(options)
+            self.issues: List[Dict[str, Any]] = []
+
+        def error(self, line_number, offset, text, check):
+            code = super().error(line_number, offset, text, check)
+            if code:
+                self.issues.append({
+                    'tool': 'pycodestyle',
+                    'file': self.filename,
+                    'line': line_number,
+                    'column': offset + 1,
+                    'message': text,
+                    'severity': 'warning'
+                })
+            return code
+
+    class _FlakesReporter(pyflakes_reporter.Reporter):
+        """pyflakes reporter that collects issues instead of printing them."""
+
+        def __init__(self, filename: str):
+            self.filename = filename
+            self.issues: List[Dict[str, Any]] = []
+
+        def unexpectedError(self, filename, msg):
+            self.issues.append({
+                'tool': 'pyflakes',
+                'file': self.filename,
+                'line': 0,
+                'column': 0,
+                'message': str(msg),
+                'severity': 'error'
+            })
+
+        def syntaxError(self, filename, msg, lineno, offset, text):
+            self.issues.append({
+                'tool': 'pyflakes',
+                'file': self.filename,
+                'line': lineno or 0,
+                'column': offset or 0,
+                'message': f"SyntaxError: {msg}",
+                'severity': 'error'
+            })
+
+        def flake(self, message):
+            self.issues.append({
+                'tool': 'pyflakes',
+                'file': self.filename,
+                'line': message.lineno,
+                'column': message.col + 1,
+                'message': message.message % message.message_args,
+                'severity': 'warning'
+            })
+
 
 class CodeAnalyzer:
     """Wrapper for static code analysis tools."""
@@ -17,25 +214,21 @@ class CodeAnalyzer:
     def __init__(self):
         """Initialize code analyzer."""
         self.available_tools = self._check_available_tools()
+        # Shared, read-only options; each check gets its own report
+        self._style_options = (
+            pycodestyle.StyleGuide(quiet=True).options if pycodestyle is not None else None
+        )
         logger.info(f"Available analysis tools: {list(self.available_tools.keys())}")
 
     def _check_available_tools(self) -> Dict[str, bool]:
         """Check which analysis tools are available."""
         tools = {}
 
-        # Check for pylint
-        try:
-            subprocess.run(['pylint', '--version'], capture_output=True, check=True)
-            tools['pylint'] = True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            tools['pylint'] = False
+        tools['pyflakes'] = pyflakes_api is not None
+        tools['pycodestyle'] = pycodestyle is not None
 
-        # Check for flake8
-        try:
-            subprocess.run(['flake8', '--version'], capture_output=True, check=True)
-            tools['flake8'] = True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            tools['flake8'] = False
+        # A PATH lookup instead of forking "flake8 --version"
+        tools['flake8'] = shutil.which('flake8') is not None
 
         return tools
 
@@ -52,46 +245,193 @@ class CodeAnalyzer:
         """
         issues = []
 
-        # Write code to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_path = f.name
+        if self._in_process_lint_available():
+            issues = self._lint_in_process(code, filename)
+
+        # Small snippets (or no flake8 at all): a quick AST pass beats the
+        # flake8 process startup
+        elif code.count('\n') < FAST_LINT_MAX_LINES or not self.available_tools.get('flake8'):
+            issues = self._fast_lint(code, filename)
+
+        # Otherwise run flake8, piping the code through stdin instead of
+        # writing and cleaning up a temp file
+        else:
+            try:
+                result = subprocess.run(
+                    ['flake8', '--stdin-display-name', filename, '-'],
+                    input=code,
+                    capture_output=True,
+                    text=True
+                )
+
+                issues.extend(
+                    issue for _, issue in self._parse_flake8_output(result.stdout, filename)
+                )
+            except Exception as e:
+                logger.debug(f"Flake8 analysis error: {e}")
+
+        return {
+            'filename': filename,
+            'issues': issues,
+            'tool_count': len([t for t in self.available_tools.values() if t])
+        }
+
+    def analyze_python_files(self, code_by_name: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze several Python files with a single flake8 run.
+
+        flake8's startup cost is paid once for the whole batch, and
+        "-j auto" spreads the files over all cores. With the in-process
+        checkers available the files are simply checked one by one.
+
+        Args:
+            code_by_name: Python code keyed by filename
+
+        Returns:
+            Analysis results keyed by filename
+        """
+        issues_by_name: Dict[str, List[Dict[str, Any]]] = {name: [] for name in code_by_name}
+
+        if self._in_process_lint_available():
+            # No process startup to amortize
+            for name, code in code_by_name.items():
+                issues_by_name[name] = self._lint_in_process(code, name)
+
+        elif self.available_tools.get('flake8') and code_by_name:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # One subdirectory per file keeps basenames without collisions
+                name_by_path = {}
+                for i, (name, code) in enumerate(code_by_name.items()):
+                    temp_path = Path(temp_dir) / str(i) / (Path(name).name or "temp.py")
+                    temp_path.parent.mkdir()
+                    self._write_file(temp_path, code.encode('utf-8'))
+                    name_by_path[str(temp_path)] = name
 
-        try:
-            # Run flake8 if available
-            if self.available_tools.get('flake8'):
                 try:
                     result = subprocess.run(
-                        ['flake8', temp_path],
+                        ['flake8', '-j', 'auto', temp_dir],
                         capture_output=True,
                         text=True
                     )
 
-                    for line in result.stdout.splitlines():
-                        if line.strip():
-                            parts = line.split(':', 3)
-                            if len(parts) >= 4:
-                                issues.append({
-                                    'tool': 'flake8',
-                                    'file': filename,
-                                    'line': int(parts[1]) if parts[1].isdigit() else 0,
-                                    'column': int(parts[2]) if parts[2].isdigit() else 0,
-                                    'message': parts[3].strip(),
-                                    'severity': 'warning'
-                                })
+                    for path, issue in self._parse_flake8_output(result.stdout):
+                        name = name_by_path.get(path)
+                        if name is not None:
+                            issue['file'] = name
+                            issues_by_name[name].append(issue)
                 except Exception as e:
                     logger.debug(f"Flake8 analysis error: {e}")
 
-        finally:
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
-
+        tool_count = len([t for t in self.available_tools.values() if t])
         return {
-            'filename': filename,
-            'issues': issues,
-            'tool_count': len([t for t in self.available_tools.values() if t])
+            name: {'filename': name, 'issues': issues, 'tool_count': tool_count}
+            for name, issues in issues_by_name.items()
         }
 
+    @staticmethod
+    def _write_file(path: Path, data: bytes):
+        """Write bytes straight to a new file descriptor, skipping the text I/O layers."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _fast_lint(code: str, filename: str) -> List[Dict[str, Any]]:
+        """
+        Lint code with the built-in AST checks.
+
+        Args:
+            code: Python code to analyze
+            filename: Filename reported for each issue
+
+        Returns:
+            List of issues in the same shape as flake8's
+        """
+        try:
+            tree = ast.parse(code, filename=filename)
+        except SyntaxError as e:
+            return [{
+                'tool': 'ast',
+                'file': filename,
+                'line': e.lineno or 0,
+                'column': e.offset or 0,
+                'message': f"SyntaxError: {e.msg}",
+                'severity': 'error'
+            }]
+
+        visitor = _FastLint(filename)
+        visitor.visit(tree)
+        return visitor.finish()
+
+    def _in_process_lint_available(self) -> bool:
+        """Whether pyflakes and pycodestyle can be run in-process."""
+        return bool(self.available_tools.get('pyflakes') and self.available_tools.get('pycodestyle'))
+
+    def _lint_in_process(self, code: str, filename: str) -> List[Dict[str, Any]]:
+        """
+        Run pyflakes and pycodestyle on in-memory code.
+
+        These are the checkers flake8 wraps, minus its subprocess startup
+        and plugin discovery.
+
+        Args:
+            code: Python code to analyze
+            filename: Filename reported for each issue
+
+        Returns:
+            List of issues in the same shape as flake8's
+        """
+        issues = []
+
+        try:
+            flakes = _FlakesReporter(filename)
+            pyflakes_api.check(code, filename, flakes)
+            issues.extend(flakes.issues)
+        except Exception as e:
+            logger.debug(f"Pyflakes analysis error: {e}")
+
+        try:
+            style = _StyleReport(self._style_options)
+            checker = pycodestyle.Checker(
+                filename,
+                lines=code.splitlines(True),
+                options=self._style_options,
+                report=style
+            )
+            checker.check_all()
+            issues.extend(style.issues)
+        except Exception as e:
+            logger.debug(f"Pycodestyle analysis error: {e}")
+
+        return issues
+
+    @staticmethod
+    def _parse_flake8_output(stdout: str, filename: str = ""):
+        """
+        Parse flake8's default "path:line:col: message" output.
+
+        Args:
+            stdout: flake8 output
+            filename: Name reported for each issue (defaults to the path)
+
+        Yields:
+            (path, issue) tuples
+        """
+        for match in _FLAKE8_RE.finditer(stdout):
+            path, line, column, message = match.groups()
+            yield path, {
+                'tool': 'flake8',
+                'file': filename or path,
+                'line': int(line),
+                'column': int(column),
+                'message': message.strip(),
+                'severity': 'warning'
+            }
+
     def analyze_code(self, code: str, language: str, filename: str = "") -> Dict[str, Any]:
         """
         Analyze code based on language.
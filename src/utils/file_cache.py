@@ -0,0 +1,30 @@
+"""
+File-system helpers for on-disk caches.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write(path: Path, data: bytes):
+    """
+    Write bytes to a file atomically.
+
+    Data is written to a temporary file in the same directory and renamed
+    over the target, so readers never observe a partially written file.
+
+    Args:
+        path: Destination file path
+        data: Bytes to write
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
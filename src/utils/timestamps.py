@@ -0,0 +1,25 @@
+"""
+Timestamp parsing helpers shared by the platform adapters.
+"""
+import functools
+from datetime import datetime
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_iso(timestamp: str) -> datetime:
+    """
+    Parse an ISO-8601 timestamp as returned by the platform APIs.
+
+    A trailing 'Z' is treated as UTC. Results are cached, since the same
+    timestamps recur across PRs fetched in a batch (datetimes are immutable,
+    so sharing them is safe).
+
+    Args:
+        timestamp: ISO-8601 timestamp string
+
+    Returns:
+        Parsed datetime
+    """
+    if timestamp.endswith('Z'):
+        timestamp = timestamp[:-1] + '+00:00'
+    return datetime.fromisoformat(timestamp)
@@ -0,0 +1,156 @@
+"""
+Tests for the unified diff parser.
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from src.data_preparation.diff_parser import DiffParser
+
+MULTI_HUNK_PATCH = """--- a/app/handlers.py
++++ b/app/handlers.py
+@@ -1,3 +1,4 @@
+ import os
++import sys
+
+ def handle():
+@@ -10,2 +11,3 @@ def handle():
+-    return None
++    value = compute()
++    return value
+ # end
+"""
+
+SINGLE_HUNK_PATCH = """@@ -5,3 +5,3 @@ def load():
+     data = read()
+-    return data
++    return parse(data)
+     # done"""
+
+
+def as_tuple(hunk):
+    return (
+        hunk.file_path, hunk.old_start, hunk.old_count, hunk.new_start, hunk.new_count,
+        hunk.added_lines, hunk.removed_lines, hunk.context_lines
+    )
+
+
+def test_multi_hunk_patch():
+    hunks = DiffParser.parse_patch(MULTI_HUNK_PATCH)
+
+    assert len(hunks) == 2
+    first, second = hunks
+    assert first.file_path == second.file_path == "app/handlers.py"
+
+    assert (first.old_start, first.old_count, first.new_start, first.new_count) == (1, 3, 1, 4)
+    assert first.added_lines == [(2, "import sys")]
+    assert first.removed_lines == []
+    assert first.context_lines == [(1, "import os"), (3, ""), (4, "def handle():")]
+
+    assert (second.old_start, second.old_count, second.new_start, second.new_count) == (10, 2, 11, 3)
+    assert second.added_lines == [(11, "    value = compute()"), (12, "    return value")]
+    assert second.removed_lines == [(10, "    return None")]
+    assert second.context_lines == [(13, "# end")]
+
+
+def test_header_without_counts_defaults_to_one_line():
+    patch = "--- a/VERSION\n+++ b/VERSION\n@@ -3 +3 @@\n-1.0.0\n+1.1.0\n@@ -9 +9 @@\n-old\n+new\n"
+
+    hunks = DiffParser.parse_patch(patch)
+
+    assert [(h.old_start, h.old_count, h.new_start, h.new_count) for h in hunks] == [(3, 1, 3, 1), (9, 1, 9, 1)]
+    assert hunks[0].added_lines == [(3, "1.1.0")]
+    assert hunks[0].removed_lines == [(3, "1.0.0")]
+    assert hunks[1].added_lines == [(9, "new")]
+
+    single = DiffParser.parse_patch("@@ -7 +7,2 @@\n-a\n+b\n+c", file_path="x.txt")
+    assert [(h.old_count, h.new_count) for h in single] == [(1, 2)]
+    assert single[0].added_lines == [(7, "b"), (8, "c")]
+
+
+def test_no_newline_marker_is_not_a_line():
+    patch = (
+        "--- a/main.go\n+++ b/main.go\n"
+        "@@ -1,2 +1,2 @@\n package main\n-func a() {}\n\\ No newline at end of file\n+func b() {}\n"
+        "\\ No newline at end of file\n"
+        "@@ -20,1 +20,1 @@\n-x\n+y\n"
+    )
+
+    hunks = DiffParser.parse_patch(patch)
+
+    assert len(hunks) == 2
+    assert hunks[0].context_lines == [(1, "package main")]
+    assert hunks[0].removed_lines == [(2, "func a() {}")]
+    assert hunks[0].added_lines == [(2, "func b() {}")]
+    assert hunks[1].added_lines == [(20, "y")]
+
+    single = DiffParser.parse_patch("@@ -1 +1 @@\n-a\n\\ No newline at end of file\n+b\n\\ No newline at end of file")
+    assert single[0].removed_lines == [(1, "a")]
+    assert single[0].added_lines == [(1, "b")]
+    assert single[0].context_lines == []
+
+
+def test_max_hunks_stops_early():
+    assert len(DiffParser.parse_patch(MULTI_HUNK_PATCH, max_hunks=1)) == 1
+    assert len(DiffParser.parse_patch(MULTI_HUNK_PATCH, max_hunks=2)) == 2
+    assert len(DiffParser.parse_patch(MULTI_HUNK_PATCH, max_hunks=5)) == 2
+
+    first = DiffParser.parse_patch(MULTI_HUNK_PATCH, max_hunks=1)[0]
+    assert as_tuple(first) == as_tuple(DiffParser.parse_patch(MULTI_HUNK_PATCH)[0])
+
+
+def test_max_added_lines_truncates_without_changing_counts():
+    hunks = DiffParser.parse_patch(MULTI_HUNK_PATCH, max_added_lines_per_hunk=1)
+
+    assert hunks[1].added_lines == [(11, "    value = compute()")]
+    assert hunks[1].new_count == 3
+    # Line numbers after the dropped lines still account for them
+    assert hunks[1].context_lines == [(13, "# end")]
+
+    patch = "@@ -1,1 +1,4 @@\n+a\n+b\n+c\n ctx"
+    single = DiffParser.parse_patch(patch, max_added_lines_per_hunk=2)
+    assert single[0].added_lines == [(1, "a"), (2, "b")]
+    assert single[0].context_lines == [(4, "ctx")]
+    assert single[0].new_count == 4
+
+
+def test_single_hunk_fast_path_matches_general_path(monkeypatch):
+    general = DiffParser.parse_patch(
+        "--- a/src/load.py\n+++ b/src/load.py\n" + SINGLE_HUNK_PATCH, file_path="src/load.py"
+    )
+    fast = DiffParser.parse_patch(SINGLE_HUNK_PATCH, file_path="src/load.py")
+
+    assert len(fast) == 1
+    assert [as_tuple(h) for h in fast] == [as_tuple(h) for h in general]
+
+    calls = []
+    original = DiffParser._parse_single_hunk
+
+    def spy(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(DiffParser, "_parse_single_hunk", staticmethod(spy))
+    DiffParser.parse_patch(SINGLE_HUNK_PATCH)
+    assert len(calls) == 1
+    DiffParser.parse_patch(MULTI_HUNK_PATCH)
+    DiffParser.parse_patch("@@ -1 +1 @@\n-a\n+b\n@@ -5 +5 @@\n-c\n+d")
+    assert len(calls) == 1
+
+
+def test_patches_without_hunks():
+    assert DiffParser.parse_patch("") == []
+    assert DiffParser.parse_patch(None) == []
+    assert DiffParser.parse_patch("Binary files a/logo.png and b/logo.png differ") == []
+
+
+def test_deleted_file_uses_source_path():
+    patch = "--- a/old.py\n+++ /dev/null\n@@ -1,2 +0,0 @@\n-a\n-b\n"
+
+    hunks = DiffParser.parse_patch(patch)
+
+    assert hunks[0].file_path == "old.py"
+    assert hunks[0].removed_lines == [(1, "a"), (2, "b")]
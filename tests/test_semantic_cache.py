@@ -0,0 +1,98 @@
+"""
+Tests for the semantic review cache.
+"""
+import hashlib
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from src.data_preparation.base_adapter import FileChange, PullRequest
+from src.rag.semantic_cache import SemanticCache
+from src.rag.vector_store import VectorStore
+
+
+class HashEmbeddings:
+    """Deterministic stand-in for EmbeddingModel: equal texts, equal vectors."""
+
+    def embed_query(self, text):
+        vector = [0.0] * 64
+        vector[hashlib.md5(text.encode()).digest()[0] % 64] = 1.0
+        return vector
+
+
+def make_pr(patches, repository="octo/app", title="Update handlers"):
+    """Build a PullRequest with one file per (filename, patch) pair."""
+    now = datetime.now()
+    files = [
+        FileChange(filename, "modified", 1, 0, 1, patch)
+        for filename, patch in patches
+    ]
+    return PullRequest(
+        platform="github", id="1", number=1, title=title, description="",
+        author="dev", created_at=now, updated_at=now, state="open",
+        source_branch="feature", target_branch="main", repository=repository,
+        url=f"https://github.com/{repository}/pull/1", files_changed=files,
+        commits_count=1, additions=len(files), deletions=0,
+        changed_files=len(files), labels=[]
+    )
+
+
+def make_cache(tmp_path):
+    return SemanticCache(
+        vector_store=VectorStore(str(tmp_path)),
+        embedding_model=HashEmbeddings(),
+        threshold=0.92,
+        ttl_seconds=3600
+    )
+
+
+def test_fingerprint_requires_patch_text():
+    assert SemanticCache.fingerprint(make_pr([("logo.png", None)])) is None
+    assert SemanticCache.fingerprint(make_pr([])) is None
+
+
+def test_fingerprint_covers_filename_and_repository():
+    base = SemanticCache.fingerprint(make_pr([("a.py", "+x = 1")]))
+
+    assert base == SemanticCache.fingerprint(make_pr([("a.py", "+x = 1")]))
+    assert base != SemanticCache.fingerprint(make_pr([("b.py", "+x = 1")]))
+    assert base != SemanticCache.fingerprint(make_pr([("a.py", "+x = 1")], repository="octo/other"))
+    assert base != SemanticCache.fingerprint(make_pr([("a.py", "+x = 2")]))
+
+
+def test_exact_lookup_matches_identical_patches_only(tmp_path):
+    cache = make_cache(tmp_path)
+    pr = make_pr([("a.py", "+x = 1")])
+    fingerprint = cache.fingerprint(pr)
+    key_text = cache.build_key_text(pr, {"files_changed": 1})
+
+    assert cache.store(cache.embed_key(key_text), key_text, "REVIEW OF PR A", fingerprint=fingerprint)
+
+    assert cache.lookup_exact(fingerprint) == "REVIEW OF PR A"
+    assert cache.lookup_exact(cache.fingerprint(make_pr([("a.py", "+x = 1")], repository="octo/other"))) is None
+    assert cache.lookup_exact(None) is None
+
+
+def test_patchless_prs_do_not_share_an_exact_hit(tmp_path):
+    cache = make_cache(tmp_path)
+    pr_a = make_pr([("assets/logo.png", None)], title="Replace logo")
+    key_text = cache.build_key_text(pr_a, {"files_changed": 1})
+    cache.store(cache.embed_key(key_text), key_text, "REVIEW OF PR A", fingerprint=cache.fingerprint(pr_a))
+
+    pr_b = make_pr([("docs/manual.pdf", None)], repository="octo/other", title="Add manual")
+    assert cache.lookup_exact(cache.fingerprint(pr_b)) is None
+
+
+def test_near_duplicate_lookup_is_scoped_to_the_repository(tmp_path):
+    cache = make_cache(tmp_path)
+    pr = make_pr([("requirements.txt", None)], title="Bump requests from 2.31 to 2.32")
+    key_text = cache.build_key_text(pr, {"files_changed": 1})
+    embedding = cache.embed_key(key_text)
+    cache.store(embedding, key_text, "REVIEW OF octo/app", repository=pr.repository)
+
+    assert cache.lookup(embedding, repository="octo/app") == "REVIEW OF octo/app"
+    assert cache.lookup(embedding, repository="octo/other") is None